@@ -10,13 +10,27 @@ import logging
 import os
 from typing import AsyncGenerator, Optional, Dict, Any
 from contextlib import asynccontextmanager
-from datetime import datetime
-import json
+from datetime import datetime, timezone
+import orjson
+
+def _json_dumps(value: Any) -> str:
+    """JSON/JSONB parameter encoder (the text codec needs str, orjson returns bytes)"""
+    return orjson.dumps(value, option=orjson.OPT_NON_STR_KEYS).decode()
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+async def _init_connection(conn: asyncpg.Connection):
+    """Per-connection setup for the pool: JSON columns bind and fetch as Python objects.
+
+    Every bound value is serialized, so pass objects - a str binds as a JSON string scalar.
+    """
+    for type_name in ('json', 'jsonb'):
+        await conn.set_type_codec(
+            type_name, schema='pg_catalog', encoder=_json_dumps, decoder=orjson.loads, format='text'
+        )
+
 class DatabaseManager:
     """Production-ready PostgreSQL database manager with connection resilience"""
     
@@ -28,6 +42,11 @@ class DatabaseManager:
         )
         self.min_connections = int(os.getenv('DB_MIN_CONNECTIONS', '5'))
         self.max_connections = int(os.getenv('DB_MAX_CONNECTIONS', '20'))
+        # Room for every distinct query the app issues, so plans are never re-prepared
+        self.statement_cache_size = int(os.getenv('DB_STATEMENT_CACHE_SIZE', '1024'))
+        self.max_inactive_connection_lifetime = float(os.getenv('DB_MAX_INACTIVE_CONNECTION_LIFETIME', '600'))
+        # Bound on both pool acquire and query, so a dead database fails probes fast
+        self.health_check_timeout = float(os.getenv('DB_HEALTH_CHECK_TIMEOUT', '2.0'))
         self._initialization_lock = asyncio.Lock()
         self._initialized = False
         
@@ -46,6 +65,10 @@ class DatabaseManager:
                         min_size=self.min_connections,
                         max_size=self.max_connections,
                         command_timeout=60,
+                        statement_cache_size=self.statement_cache_size,
+                        max_cached_statement_lifetime=0,  # Keep prepared statements for the connection's life
+                        max_inactive_connection_lifetime=self.max_inactive_connection_lifetime,
+                        init=_init_connection,
                         server_settings={
                             'jit': 'off',  # Disable JIT for faster startup
                             'timezone': 'UTC'
@@ -87,6 +110,7 @@ class DatabaseManager:
         """Close database connection pool"""
         if self.pool:
             await self.pool.close()
+            self.pool = None
             self._initialized = False
             logger.info("🔒 Database connection pool closed")
     
@@ -104,7 +128,8 @@ class DatabaseManager:
                 yield connection
             except Exception as e:
                 logger.error(f"Database operation error: {e}")
-                await connection.execute("ROLLBACK")  # Rollback any pending transaction
+                if connection.is_in_transaction():
+                    await connection.execute("ROLLBACK")  # Rollback any pending transaction
                 raise
     
     async def execute_query(self, query: str, *args) -> None:
@@ -127,9 +152,17 @@ class DatabaseManager:
     async def health_check(self) -> dict:
         """Perform database health check"""
         try:
-            async with self.get_connection() as conn:
-                # Test basic connectivity
-                result = await conn.fetchval('SELECT 1')
+            if not self.pool or not self._initialized:
+                await self.initialize()
+            
+            async with self.pool.acquire(timeout=self.health_check_timeout) as conn:
+                # Connectivity, database size and activity in one round-trip
+                db_stats = await conn.fetchrow("""
+                    SELECT 
+                        1 as connected,
+                        pg_database_size(current_database()) as db_size_bytes,
+                        (SELECT count(*) FROM pg_stat_activity WHERE state = 'active') as active_connections
+                """, timeout=self.health_check_timeout)
                 
                 # Check connection pool status
                 pool_stats = {
@@ -139,17 +172,10 @@ class DatabaseManager:
                     "max_connections": self.max_connections
                 }
                 
-                # Check database size and performance
-                db_stats = await conn.fetchrow("""
-                    SELECT 
-                        pg_database_size(current_database()) as db_size_bytes,
-                        (SELECT count(*) FROM pg_stat_activity WHERE state = 'active') as active_connections
-                """)
-                
                 return {
                     "status": "healthy",
-                    "connected": bool(result),
-                    "timestamp": datetime.now().isoformat(),
+                    "connected": bool(db_stats and db_stats['connected']),
+                    "timestamp": datetime.now(timezone.utc).isoformat(),
                     "pool_stats": pool_stats,
                     "database_size_mb": round(db_stats['db_size_bytes'] / 1024 / 1024, 2) if db_stats else 0,
                     "active_connections": db_stats['active_connections'] if db_stats else 0
@@ -159,7 +185,7 @@ class DatabaseManager:
             return {
                 "status": "unhealthy",
                 "error": str(e),
-                "timestamp": datetime.now().isoformat()
+                "timestamp": datetime.now(timezone.utc).isoformat()
             }
     
     async def get_stats(self) -> Dict[str, Any]:
@@ -253,147 +279,143 @@ db_manager = DatabaseManager()
 async def get_db() -> AsyncGenerator[asyncpg.Connection, None]:
     """FastAPI dependency for database connections"""
     # Ensure database is initialized
-    if not db_manager.pool:
+    if not db_manager.pool or not db_manager._initialized:
         await db_manager.initialize()
-    async with db_manager.get_connection() as conn:
+    # Route errors (404s, validation) are re-raised into this generator; the pool's
+    # release already rolls back any open transaction, so don't spend a round-trip on it
+    async with db_manager.pool.acquire() as conn:
         yield conn
 
+# Complete schema as one script: asyncpg sends an argument-less execute() over the simple
+# query protocol, so every statement goes in a single round-trip (and implicit transaction)
+SCHEMA_DDL = '''
+    -- Enable UUID extension
+    CREATE EXTENSION IF NOT EXISTS "uuid-ossp";
+
+    -- Users table
+    CREATE TABLE IF NOT EXISTS users (
+        id UUID PRIMARY KEY DEFAULT uuid_generate_v4(),
+        email VARCHAR(255) UNIQUE NOT NULL,
+        hashed_password VARCHAR(255) NOT NULL,
+        full_name VARCHAR(255),
+        is_active BOOLEAN DEFAULT TRUE,
+        is_verified BOOLEAN DEFAULT FALSE,
+        created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
+        updated_at TIMESTAMP WITH TIME ZONE DEFAULT NOW()
+    );
+
+    -- Voice conversations table (Revolutionary VoiceBotics)
+    CREATE TABLE IF NOT EXISTS voice_conversations (
+        id UUID PRIMARY KEY DEFAULT uuid_generate_v4(),
+        session_id VARCHAR(255) UNIQUE NOT NULL,
+        user_id UUID REFERENCES users(id) ON DELETE CASCADE,
+        conversation_history JSONB NOT NULL DEFAULT '[]',
+        founder_type_detected VARCHAR(50),
+        business_validation_requested BOOLEAN DEFAULT FALSE,
+        strategy_validated BOOLEAN DEFAULT FALSE,
+        founder_ai_agreement JSONB,
+        conversation_state VARCHAR(50) DEFAULT 'active',
+        created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
+        updated_at TIMESTAMP WITH TIME ZONE DEFAULT NOW()
+    );
+
+    -- Projects table (Core entity)
+    CREATE TABLE IF NOT EXISTS projects (
+        id UUID PRIMARY KEY DEFAULT uuid_generate_v4(),
+        project_name VARCHAR(255) NOT NULL,
+        user_id UUID REFERENCES users(id) ON DELETE CASCADE,
+        conversation_session_id UUID REFERENCES voice_conversations(id),
+        founder_ai_agreement JSONB,
+        github_repo_url VARCHAR(500),
+        deployment_url VARCHAR(500),
+        smart_contract_address VARCHAR(255),
+        technology_stack JSONB DEFAULT '["FastAPI", "React", "PostgreSQL"]',
+        status VARCHAR(50) DEFAULT 'planning',
+        created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
+        updated_at TIMESTAMP WITH TIME ZONE DEFAULT NOW()
+    );
+
+    -- Dream sessions table (Layer 1 - Build)
+    CREATE TABLE IF NOT EXISTS dream_sessions (
+        id UUID PRIMARY KEY DEFAULT uuid_generate_v4(),
+        project_id UUID REFERENCES projects(id) ON DELETE CASCADE,
+        user_input TEXT NOT NULL,
+        strategic_analysis JSONB,
+        generated_files JSONB,
+        generation_quality_score DECIMAL(3,2),
+        status VARCHAR(50) DEFAULT 'pending',
+        created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW()
+    );
+
+    -- Debug sessions table (Layer 2 - Debug)
+    CREATE TABLE IF NOT EXISTS debug_sessions (
+        id UUID PRIMARY KEY DEFAULT uuid_generate_v4(),
+        project_id UUID REFERENCES projects(id) ON DELETE CASCADE,
+        debug_request TEXT NOT NULL,
+        analysis_results JSONB,
+        suggestions JSONB,
+        code_modifications JSONB,
+        monaco_workspace_state JSONB,
+        collaboration_users JSONB DEFAULT '[]',
+        github_sync_history JSONB DEFAULT '[]',
+        status VARCHAR(50) DEFAULT 'active',
+        created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW()
+    );
+
+    -- Business validations table
+    CREATE TABLE IF NOT EXISTS business_validations (
+        id UUID PRIMARY KEY DEFAULT uuid_generate_v4(),
+        conversation_id VARCHAR(255) NOT NULL,
+        market_analysis JSONB,
+        competitor_research JSONB,
+        business_model_validation JSONB,
+        strategy_recommendations JSONB,
+        validation_score DECIMAL(3,2),
+        created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
+        updated_at TIMESTAMP WITH TIME ZONE DEFAULT NOW()
+    );
+
+    -- Contract compliance table (Patent-worthy)
+    CREATE TABLE IF NOT EXISTS contract_compliance (
+        id UUID PRIMARY KEY DEFAULT uuid_generate_v4(),
+        project_id UUID REFERENCES projects(id) ON DELETE CASCADE,
+        founder_contract JSONB NOT NULL,
+        compliance_monitoring JSONB DEFAULT '[]',
+        deviation_alerts JSONB DEFAULT '[]',
+        compliance_score DECIMAL(3,2) DEFAULT 1.0,
+        created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW()
+    );
+
+    -- Revenue sharing table (Patent-worthy)
+    CREATE TABLE IF NOT EXISTS revenue_sharing (
+        id UUID PRIMARY KEY DEFAULT uuid_generate_v4(),
+        project_id UUID REFERENCES projects(id) ON DELETE CASCADE,
+        smart_contract_address VARCHAR(255),
+        revenue_tracked DECIMAL(15,2) DEFAULT 0.00,
+        platform_share DECIMAL(15,2) DEFAULT 0.00,
+        digital_fingerprint VARCHAR(500),
+        status VARCHAR(50) DEFAULT 'active',
+        created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW()
+    );
+
+    -- Create indexes for performance
+    CREATE INDEX IF NOT EXISTS idx_users_email ON users(email);
+    CREATE INDEX IF NOT EXISTS idx_projects_user_id ON projects(user_id);
+    CREATE INDEX IF NOT EXISTS idx_projects_status ON projects(status);
+    CREATE INDEX IF NOT EXISTS idx_voice_conversations_user_id ON voice_conversations(user_id);
+    CREATE INDEX IF NOT EXISTS idx_dream_sessions_project_id ON dream_sessions(project_id);
+    CREATE INDEX IF NOT EXISTS idx_debug_sessions_project_id ON debug_sessions(project_id);
+    CREATE INDEX IF NOT EXISTS idx_business_validations_conversation_id ON business_validations(conversation_id);
+    CREATE INDEX IF NOT EXISTS idx_contract_compliance_project_id ON contract_compliance(project_id);
+    CREATE INDEX IF NOT EXISTS idx_revenue_sharing_project_id ON revenue_sharing(project_id);
+    -- Conversation history listing: WHERE user_id = $1 ORDER BY created_at DESC
+    CREATE INDEX IF NOT EXISTS idx_voice_conversations_user_created ON voice_conversations(user_id, created_at DESC);
+'''
+
 async def init_db():
     """Initialize database with complete schema"""
     async with db_manager.get_connection() as conn:
-        
-        # Enable UUID extension
-        await conn.execute('CREATE EXTENSION IF NOT EXISTS "uuid-ossp"')
-        
-        # Users table
-        await conn.execute('''
-            CREATE TABLE IF NOT EXISTS users (
-                id UUID PRIMARY KEY DEFAULT uuid_generate_v4(),
-                email VARCHAR(255) UNIQUE NOT NULL,
-                hashed_password VARCHAR(255) NOT NULL,
-                full_name VARCHAR(255),
-                is_active BOOLEAN DEFAULT TRUE,
-                is_verified BOOLEAN DEFAULT FALSE,
-                created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
-                updated_at TIMESTAMP WITH TIME ZONE DEFAULT NOW()
-            )
-        ''')
-        
-        # Voice conversations table (Revolutionary VoiceBotics)
-        await conn.execute('''
-            CREATE TABLE IF NOT EXISTS voice_conversations (
-                id UUID PRIMARY KEY DEFAULT uuid_generate_v4(),
-                session_id VARCHAR(255) UNIQUE NOT NULL,
-                user_id UUID REFERENCES users(id) ON DELETE CASCADE,
-                conversation_history JSONB NOT NULL DEFAULT '[]',
-                founder_type_detected VARCHAR(50),
-                business_validation_requested BOOLEAN DEFAULT FALSE,
-                strategy_validated BOOLEAN DEFAULT FALSE,
-                founder_ai_agreement JSONB,
-                conversation_state VARCHAR(50) DEFAULT 'active',
-                created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
-                updated_at TIMESTAMP WITH TIME ZONE DEFAULT NOW()
-            )
-        ''')
-        
-        # Projects table (Core entity)
-        await conn.execute('''
-            CREATE TABLE IF NOT EXISTS projects (
-                id UUID PRIMARY KEY DEFAULT uuid_generate_v4(),
-                project_name VARCHAR(255) NOT NULL,
-                user_id UUID REFERENCES users(id) ON DELETE CASCADE,
-                conversation_session_id UUID REFERENCES voice_conversations(id),
-                founder_ai_agreement JSONB,
-                github_repo_url VARCHAR(500),
-                deployment_url VARCHAR(500),
-                smart_contract_address VARCHAR(255),
-                technology_stack JSONB DEFAULT '["FastAPI", "React", "PostgreSQL"]',
-                status VARCHAR(50) DEFAULT 'planning',
-                created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
-                updated_at TIMESTAMP WITH TIME ZONE DEFAULT NOW()
-            )
-        ''')
-        
-        # Dream sessions table (Layer 1 - Build)
-        await conn.execute('''
-            CREATE TABLE IF NOT EXISTS dream_sessions (
-                id UUID PRIMARY KEY DEFAULT uuid_generate_v4(),
-                project_id UUID REFERENCES projects(id) ON DELETE CASCADE,
-                user_input TEXT NOT NULL,
-                strategic_analysis JSONB,
-                generated_files JSONB,
-                generation_quality_score DECIMAL(3,2),
-                status VARCHAR(50) DEFAULT 'pending',
-                created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW()
-            )
-        ''')
-        
-        # Debug sessions table (Layer 2 - Debug)
-        await conn.execute('''
-            CREATE TABLE IF NOT EXISTS debug_sessions (
-                id UUID PRIMARY KEY DEFAULT uuid_generate_v4(),
-                project_id UUID REFERENCES projects(id) ON DELETE CASCADE,
-                debug_request TEXT NOT NULL,
-                analysis_results JSONB,
-                suggestions JSONB,
-                code_modifications JSONB,
-                monaco_workspace_state JSONB,
-                collaboration_users JSONB DEFAULT '[]',
-                github_sync_history JSONB DEFAULT '[]',
-                status VARCHAR(50) DEFAULT 'active',
-                created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW()
-            )
-        ''')
-        
-        # Business validations table
-        await conn.execute('''
-            CREATE TABLE IF NOT EXISTS business_validations (
-                id UUID PRIMARY KEY DEFAULT uuid_generate_v4(),
-                conversation_id VARCHAR(255) NOT NULL,
-                market_analysis JSONB,
-                competitor_research JSONB,
-                business_model_validation JSONB,
-                strategy_recommendations JSONB,
-                validation_score DECIMAL(3,2),
-                created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
-                updated_at TIMESTAMP WITH TIME ZONE DEFAULT NOW()
-            )
-        ''')
-        
-        # Contract compliance table (Patent-worthy)
-        await conn.execute('''
-            CREATE TABLE IF NOT EXISTS contract_compliance (
-                id UUID PRIMARY KEY DEFAULT uuid_generate_v4(),
-                project_id UUID REFERENCES projects(id) ON DELETE CASCADE,
-                founder_contract JSONB NOT NULL,
-                compliance_monitoring JSONB DEFAULT '[]',
-                deviation_alerts JSONB DEFAULT '[]',
-                compliance_score DECIMAL(3,2) DEFAULT 1.0,
-                created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW()
-            )
-        ''')
-        
-        # Revenue sharing table (Patent-worthy)
-        await conn.execute('''
-            CREATE TABLE IF NOT EXISTS revenue_sharing (
-                id UUID PRIMARY KEY DEFAULT uuid_generate_v4(),
-                project_id UUID REFERENCES projects(id) ON DELETE CASCADE,
-                smart_contract_address VARCHAR(255),
-                revenue_tracked DECIMAL(15,2) DEFAULT 0.00,
-                platform_share DECIMAL(15,2) DEFAULT 0.00,
-                digital_fingerprint VARCHAR(500),
-                status VARCHAR(50) DEFAULT 'active',
-                created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW()
-            )
-        ''')
-        
-        # Create indexes for performance
-        await conn.execute('CREATE INDEX IF NOT EXISTS idx_users_email ON users(email)')
-        await conn.execute('CREATE INDEX IF NOT EXISTS idx_projects_user_id ON projects(user_id)')
-        await conn.execute('CREATE INDEX IF NOT EXISTS idx_projects_status ON projects(status)')
-        await conn.execute('CREATE INDEX IF NOT EXISTS idx_voice_conversations_user_id ON voice_conversations(user_id)')
-        await conn.execute('CREATE INDEX IF NOT EXISTS idx_dream_sessions_project_id ON dream_sessions(project_id)')
-        await conn.execute('CREATE INDEX IF NOT EXISTS idx_debug_sessions_project_id ON debug_sessions(project_id)')
+        await conn.execute(SCHEMA_DDL)
         
         logger.info("✅ Database schema initialized successfully")
         
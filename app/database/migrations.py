@@ -290,6 +290,13 @@ class DatabaseMigration:
                         BEFORE UPDATE ON voice_conversations 
                         FOR EACH ROW EXECUTE FUNCTION update_updated_at_column();
                 '''
+            },
+            {
+                "version": "009",
+                "name": "Add conversation listing index",
+                "sql": '''
+                    CREATE INDEX IF NOT EXISTS idx_voice_conversations_user_created ON voice_conversations(user_id, created_at DESC);
+                '''
             }
         ]
 
@@ -306,6 +313,13 @@ async def run_database_migrations(database_url: str = None) -> bool:
 if __name__ == "__main__":
     import asyncio
     
+    # uvloop ships with uvicorn[standard]; use it for the CLI too when present
+    try:
+        import uvloop
+        uvloop.install()
+    except ImportError:
+        pass
+    
     async def main():
         success = await run_database_migrations()
         if success:
@@ -11,9 +11,9 @@ Features:
 - Complete GitHub workflow (SEAMLESS)
 """
 
-import os
 import asyncio
 import logging
+import time
 from contextlib import asynccontextmanager
 from typing import Optional, Dict, Any
 from datetime import datetime
@@ -24,7 +24,7 @@ from fastapi.staticfiles import StaticFiles
 from fastapi.templating import Jinja2Templates
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.middleware.trustedhost import TrustedHostMiddleware
-from fastapi.responses import JSONResponse, HTMLResponse
+from fastapi.responses import HTMLResponse, ORJSONResponse
 
 # Core imports
 from app.services import service_manager
@@ -33,8 +33,6 @@ from app.database.models import *
 from app.utils.auth_utils import get_optional_current_user
 from app.config import settings, get_settings
 
-# Database and models
-import asyncpg
 
 # Core utilities
 from app.utils.logger import get_logger
@@ -54,25 +52,18 @@ from app.routes.auth_router import router as auth_router
 # Initialize logger
 logger = logging.getLogger(__name__)
 
-# Database manager instance
-db_manager = None
-
 DEMO_USER_ID = "00000000-0000-0000-0000-000000000001"
 
 async def ensure_demo_user():
     """Ensure the demo user with a valid UUID exists in the users table."""
-    database_url = os.getenv('DATABASE_URL')
-    if not database_url:
-        logger.warning("DATABASE_URL not set; skipping demo user creation.")
-        return
-    conn = await asyncpg.connect(database_url)
-    await conn.execute(
-        "INSERT INTO users (id, email, hashed_password, full_name, is_active, is_verified) "
-        "VALUES ($1, $2, $3, $4, $5, $6) "
-        "ON CONFLICT (id) DO NOTHING;",
-        DEMO_USER_ID, 'demo@example.com', '', 'Demo User', True, True
-    )
-    await conn.close()
+    # Runs on the shared pool rather than opening a dedicated connection at startup
+    async with db_manager.get_connection() as conn:
+        await conn.execute(
+            "INSERT INTO users (id, email, hashed_password, full_name, is_active, is_verified) "
+            "VALUES ($1, $2, $3, $4, $5, $6) "
+            "ON CONFLICT (id) DO NOTHING;",
+            DEMO_USER_ID, 'demo@example.com', '', 'Demo User', True, True
+        )
 
 async def create_tables():
     """Create database tables if they don't exist"""
@@ -165,16 +156,12 @@ async def lifespan(app: FastAPI):
     # Startup
     logger.info("🚀 Starting AI Debugger Factory...")
 
-    # Ensure demo user exists before anything else
-    await ensure_demo_user()
-
-    # Initialize database FIRST
+    # Initialize database FIRST - the same pool get_db and the services use
     try:
-        global db_manager
-        from app.database.db import DatabaseManager
-        db_manager = DatabaseManager()
         await db_manager.initialize()
         await create_tables()
+        # Ensure demo user exists before anything else uses the database
+        await ensure_demo_user()
         logger.info("✅ Database initialized successfully")
     except Exception as e:
         logger.error(f"❌ Database initialization failed: {e}")
@@ -214,7 +201,8 @@ app = FastAPI(
     version="1.0.0",
     docs_url="/docs" if settings.DEBUG else None,
     redoc_url="/redoc" if settings.DEBUG else None,
-    lifespan=lifespan
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse
 )
 
 # ==========================================
@@ -236,27 +224,57 @@ app.add_middleware(
     allowed_hosts=["*"] if settings.DEBUG else settings.ALLOWED_HOSTS
 )
 
+# Probe and asset paths whose successful requests aren't worth a log line, checked with
+# one set lookup plus one C-level prefix test instead of a per-request loop
+_UNLOGGED_PATHS = frozenset({"/health", "/metrics", "/favicon.ico"})
+_UNLOGGED_PREFIXES = ("/static/",)
+
 # Request/Response logging middleware
 @app.middleware("http")
 async def logging_middleware(request: Request, call_next):
     """Log all requests and responses"""
-    start_time = asyncio.get_event_loop().time()
-    logger.info(f"[MIDDLEWARE] Incoming request: {request.method} {request.url}")
+    start_ns = time.perf_counter_ns()
     try:
         response = await call_next(request)
     except Exception as e:
-        logger.error(f"[MIDDLEWARE] Exception during request: {e}")
+        logger.error("[MIDDLEWARE] Exception during request: %s %s - %s", request.method, request.url, e)
         raise
-    process_time = asyncio.get_event_loop().time() - start_time
-    logger.info(f"[MIDDLEWARE] {request.method} {request.url} - {response.status_code} - {process_time:.3f}s")
+    # Integer nanosecond delta; converted to float seconds once for the log and header
+    process_time = (time.perf_counter_ns() - start_ns) / 1_000_000_000
+    # One record per request, formatted only if a handler emits it
+    path = request.url.path
+    if response.status_code >= 400 or not (path in _UNLOGGED_PATHS or path.startswith(_UNLOGGED_PREFIXES)):
+        logger.info("[MIDDLEWARE] %s %s - %s - %.3fs", request.method, request.url, response.status_code, process_time)
     response.headers["X-Process-Time"] = str(process_time)
     return response
 
-# Error handling middleware
+# Upload size guard - Whisper caps audio at 25MB, so refuse bigger transcription
+# uploads from Content-Length before the multipart body is received and spooled
+MAX_AUDIO_UPLOAD_BYTES = 25 * 1024 * 1024 + 64 * 1024  # plus multipart framing
+
+@app.middleware("http")
+async def audio_upload_size_guard(request: Request, call_next):
+    """Short-circuit oversized transcription uploads with 413"""
+    if request.method == "POST" and "/voice-conversation/transcribe-audio/" in request.url.path:
+        content_length = request.headers.get("content-length", "")
+        if content_length.isdigit() and int(content_length) > MAX_AUDIO_UPLOAD_BYTES:
+            logger.warning(f"[UPLOAD] Rejected {content_length} byte audio upload - {request.url.path}")
+            return ORJSONResponse(
+                status_code=413,
+                content={
+                    "status": "error",
+                    "message": f"Audio upload too large: {content_length} bytes (max: {MAX_AUDIO_UPLOAD_BYTES})",
+                    "timestamp": asyncio.get_event_loop().time(),
+                    "path": str(request.url.path)
+                }
+            )
+    return await call_next(request)
+
+# Error handling middleware (error bodies go through the same orjson-backed response class)
 @app.exception_handler(HTTPException)
 async def http_exception_handler(request: Request, exc: HTTPException):
     logger.warning(f"[EXCEPTION] HTTP {exc.status_code}: {exc.detail} - {request.method} {request.url}")
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=exc.status_code,
         content={
             "status": "error",
@@ -270,7 +288,7 @@ async def http_exception_handler(request: Request, exc: HTTPException):
 async def global_exception_handler(request: Request, exc: Exception):
     import traceback
     logger.error(f"[EXCEPTION] Global exception: {exc}\n{traceback.format_exc()}")
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=500,
         content={"detail": f"Internal server error: {str(exc)}"}
     )
@@ -351,7 +369,6 @@ app.include_router(
 # ==========================================
 # STATIC FILES (Frontend SPA catch-all)
 # ==========================================
-from fastapi.staticfiles import StaticFiles
 app.mount("/static", StaticFiles(directory="app/templates", html=True), name="static")
 
 # ==========================================
@@ -405,7 +422,7 @@ async def health_check():
         }
     except Exception as e:
         logger.error(f"Health check failed: {e}")
-        return JSONResponse(
+        return ORJSONResponse(
             status_code=503,
             content={
                 "status": "unhealthy",
@@ -609,11 +626,5 @@ if __name__ == "__main__":
         log_level="info"
     )
 
-# Catch-all logging middleware (logs every request before routing)
-@app.middleware("http")
-async def catch_all_logging_middleware(request: Request, call_next):
-    logger.info(f"[CATCH-ALL] {request.method} {request.url.path}")
-    response = await call_next(request)
-    return response
 
 
@@ -10,7 +10,6 @@ import asyncio
 from datetime import datetime
 import uuid
 import asyncpg
-import json
 
 from app.database.db import get_db
 from app.database.models import *
@@ -77,14 +76,14 @@ async def analyze_market_opportunity(
                 """UPDATE business_validations 
                 SET market_analysis = $1, updated_at = NOW()
                 WHERE conversation_id = $2""",
-                json.dumps({
+                {
                     "market_size": market_analysis.market_size,
                     "growth_rate": market_analysis.growth_rate,
                     "key_trends": market_analysis.key_trends,
                     "opportunities": market_analysis.opportunities,
                     "threats": market_analysis.threats,
                     "confidence_score": market_analysis.confidence_score
-                }),
+                },
                 conversation_id
             )
             validation_id = existing['id']
@@ -97,14 +96,14 @@ async def analyze_market_opportunity(
                 validation_id,
                 conversation_id,
                 user_id,
-                json.dumps({
+                {
                     "market_size": market_analysis.market_size,
                     "growth_rate": market_analysis.growth_rate,
                     "key_trends": market_analysis.key_trends,
                     "opportunities": market_analysis.opportunities,
                     "threats": market_analysis.threats,
                     "confidence_score": market_analysis.confidence_score
-                })
+                }
             )
         
         logger.info(f"Market analysis completed for user: {user_id}, conversation: {conversation_id}")
@@ -172,13 +171,13 @@ async def research_competitors(
                 """UPDATE business_validations 
                 SET competitor_research = $1, updated_at = NOW()
                 WHERE conversation_id = $2""",
-                json.dumps({
+                {
                     "direct_competitors": competitor_analysis.direct_competitors,
                     "indirect_competitors": competitor_analysis.indirect_competitors,
                     "competitive_advantages": competitor_analysis.competitive_advantages,
                     "market_gaps": competitor_analysis.market_gaps,
                     "differentiation_strategy": competitor_analysis.differentiation_strategy
-                }),
+                },
                 request.conversation_id
             )
         
@@ -236,7 +235,7 @@ async def validate_business_model(
             )
         
         # Convert to MarketAnalysis object
-        market_data = json.loads(db_validation['market_analysis'])
+        market_data = db_validation['market_analysis']
         market_analysis = MarketAnalysis(
             market_size=market_data["market_size"],
             growth_rate=market_data["growth_rate"],
@@ -257,13 +256,13 @@ async def validate_business_model(
             """UPDATE business_validations 
             SET business_model_validation = $1, validation_score = $2, updated_at = NOW()
             WHERE conversation_id = $3""",
-            json.dumps({
+            {
                 "feasibility_score": validation.feasibility_score,
                 "market_potential": validation.market_potential,
                 "revenue_projection": validation.revenue_projection,
                 "risk_assessment": validation.risk_assessment,
                 "recommendations": validation.recommendations
-            }),
+            },
             validation.feasibility_score,
             request.conversation_id
         )
@@ -316,9 +315,9 @@ async def generate_comprehensive_business_plan(
         # Create business plan from validation data
         business_plan = await service_manager.business_intelligence.create_business_plan(
             business_idea=request.business_idea,
-            market_analysis=MarketAnalysis(**json.loads(db_validation['market_analysis'])),
-            competitor_analysis=CompetitorAnalysis(**json.loads(db_validation['competitor_research'])),
-            validation=BusinessValidation(**json.loads(db_validation['business_model_validation']))
+            market_analysis=MarketAnalysis(**db_validation['market_analysis']),
+            competitor_analysis=CompetitorAnalysis(**db_validation['competitor_research']),
+            validation=BusinessValidation(**db_validation['business_model_validation'])
         )
         
         # Store business plan
@@ -326,7 +325,7 @@ async def generate_comprehensive_business_plan(
             """UPDATE business_validations 
             SET strategy_recommendations = $1, updated_at = NOW()
             WHERE conversation_id = $2""",
-            json.dumps(business_plan),
+            business_plan,
             request.conversation_id
         )
         
@@ -369,10 +368,10 @@ async def get_validation_summary(
     return BusinessValidationSummaryResponse(
         validation_id=db_validation['id'],
         conversation_id=conversation_id,
-        market_analysis=json.loads(db_validation['market_analysis']),
-        competitor_research=json.loads(db_validation['competitor_research']),
-        business_model_validation=json.loads(db_validation['business_model_validation']),
-        strategy_recommendations=json.loads(db_validation['strategy_recommendations']),
+        market_analysis=db_validation['market_analysis'],
+        competitor_research=db_validation['competitor_research'],
+        business_model_validation=db_validation['business_model_validation'],
+        strategy_recommendations=db_validation['strategy_recommendations'],
         overall_validation_score=db_validation['validation_score'],
         created_at=db_validation['created_at'].isoformat()
     )
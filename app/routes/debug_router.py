@@ -247,7 +247,7 @@ async def apply_debug_changes(
             
             if project and project.github_repo_url and github_integration:
                 sync_result = await github_integration.sync_project_changes(
-                    repo_name=project.github_repo_url.split('/')[-1],
+                    repo_name=project.github_repo_url.rpartition('/')[2],
                     changed_files={request.changes["file_path"]: "updated_content"}
                 )
                 
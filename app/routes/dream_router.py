@@ -57,33 +57,30 @@ async def analyze_strategic_requirements(
     )
     
     if not project:
-        # Create new project
+        # Create new project (RETURNING hands back the row without a second query)
         project_id = request.project_id or str(uuid.uuid4())
-        await db.execute(
+        project = await db.fetchrow(
             """INSERT INTO projects 
             (id, project_name, user_id, technology_stack, status, created_at, updated_at)
-            VALUES ($1, $2, $3, $4, $5, NOW(), NOW())""",
+            VALUES ($1, $2, $3, $4, $5, NOW(), NOW())
+            RETURNING *""",
             project_id,
             f"Project {project_id[-6:]}",
             user_id,
-            json.dumps(["FastAPI", "React", "PostgreSQL"]),
+            ["FastAPI", "React", "PostgreSQL"],
             "planning"
         )
-        
-        project = await db.fetchrow(
-            "SELECT * FROM projects WHERE id = $1", project_id
-        )
     
     # Store founder agreement if provided
     if hasattr(request, 'founder_agreement') and request.founder_agreement:
         await db.execute(
             "UPDATE projects SET founder_ai_agreement = $1, updated_at = NOW() WHERE id = $2",
-            json.dumps(request.founder_agreement), project['id']
+            request.founder_agreement, project['id']
         )
     
     try:
         # Prepare founder agreement
-        founder_agreement = json.loads(project['founder_ai_agreement']) if project['founder_ai_agreement'] else {}
+        founder_agreement = project['founder_ai_agreement'] or {}
         if hasattr(request, 'additional_requirements') and request.additional_requirements:
             founder_agreement['additional_requirements'] = request.additional_requirements
 
@@ -106,14 +103,14 @@ async def analyze_strategic_requirements(
             dream_session_id,
             project['id'],
             json.dumps(founder_agreement),
-            json.dumps({
+            {
                 "business_context": strategic_analysis.business_context,
                 "technical_requirements": strategic_analysis.technical_requirements,
                 "architecture_recommendations": strategic_analysis.architecture_recommendations,
                 "implementation_strategy": strategic_analysis.implementation_strategy,
                 "risk_assessment": strategic_analysis.risk_assessment,
                 "timeline_estimate": strategic_analysis.timeline_estimate
-            }),
+            },
             "analysis_complete"
         )
         
@@ -159,12 +156,6 @@ async def generate_production_code(
         # Deep debug: Log incoming request and analysis_id
         logger.info(f"[DEBUG] Incoming analysis_id: {request.analysis_id}")
         logger.info(f"[DEBUG] Full request payload: {request.dict()}")
-        # Log all dream_sessions IDs in the DB for this user
-        all_sessions = await db.fetch("SELECT id, project_id, status FROM dream_sessions WHERE project_id IN (SELECT id FROM projects WHERE user_id = $1)", user_id)
-        logger.info(f"[DEBUG] All dream_sessions for user {user_id}: {[dict(row) for row in all_sessions]}")
-        # Log all project IDs for the user
-        all_projects = await db.fetch("SELECT id, project_name FROM projects WHERE user_id = $1", user_id)
-        logger.info(f"[DEBUG] All projects for user {user_id}: {[dict(row) for row in all_projects]}")
         # Log the exact query used for dream_session
         logger.info(f"[DEBUG] Query: SELECT ds.*, p.founder_ai_agreement, p.project_name FROM dream_sessions ds JOIN projects p ON ds.project_id = p.id WHERE ds.id = {request.analysis_id} AND p.user_id = {user_id}")
         
@@ -186,13 +177,23 @@ async def generate_production_code(
         
         if not dream_session:
             logger.error(f"[DEBUG] No dream_session found for analysis_id={request.analysis_id} and user_id={user_id}")
+            # Only a miss needs the user's sessions/projects listed, so the lookups run here
+            # (one round-trip) instead of on every generation request
+            user_rows = await db.fetch(
+                """SELECT 'dream_session' AS kind, ds.id::text AS id, ds.project_id::text AS detail, ds.status
+                FROM dream_sessions ds JOIN projects p ON ds.project_id = p.id WHERE p.user_id = $1
+                UNION ALL
+                SELECT 'project', id::text, project_name, NULL FROM projects WHERE user_id = $1""",
+                user_id
+            )
+            logger.info(f"[DEBUG] Dream sessions and projects for user {user_id}: {[dict(row) for row in user_rows]}")
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="Strategic analysis not found"
             )
         
         # Create strategic analysis object
-        strategic_analysis_data = json.loads(dream_session['strategic_analysis'])
+        strategic_analysis_data = dream_session['strategic_analysis']
         strategic_analysis = StrategicAnalysis(
             business_context=strategic_analysis_data["business_context"],
             technical_requirements=strategic_analysis_data["technical_requirements"],
@@ -203,7 +204,7 @@ async def generate_production_code(
         )
         
         # Generate production code
-        founder_agreement = json.loads(dream_session['founder_ai_agreement']) if dream_session['founder_ai_agreement'] else {}
+        founder_agreement = dream_session['founder_ai_agreement'] or {}
         code_generation_result = await service_manager.dream_engine.generate_production_code(
             strategic_analysis=strategic_analysis,
             founder_agreement=founder_agreement
@@ -237,12 +238,12 @@ async def generate_production_code(
             """UPDATE dream_sessions 
             SET generated_files = $1, generation_quality_score = $2, status = $3
             WHERE id = $4""",
-            json.dumps({
+            {
                 "files": watermarked_files,
                 "project_structure": code_generation_result.project_structure,
                 "deployment_instructions": code_generation_result.deployment_instructions,
                 "testing_guide": code_generation_result.testing_guide
-            }),
+            },
             code_generation_result.quality_score,
             "code_generated",
             request.analysis_id
@@ -314,7 +315,7 @@ async def get_generation_status(
         status=dream_session['status'],
         progress_percentage=100 if dream_session['status'] == "code_generated" else 50,
         quality_score=dream_session['generation_quality_score'],
-        files_generated=len(json.loads(dream_session['generated_files'])['files']) if dream_session['generated_files'] else 0,
+        files_generated=len(dream_session['generated_files']['files']) if dream_session['generated_files'] else 0,
         estimated_completion="Completed" if dream_session['status'] == "code_generated" else "In progress"
     )
 
@@ -376,34 +377,41 @@ async def download_generated_code(
 ):
     """Download generated code as ZIP file"""
     
-    dream_session = await db.fetchrow(
-        """SELECT ds.*, p.founder_ai_agreement, p.project_name
-        FROM dream_sessions ds
-        JOIN projects p ON ds.project_id = p.id
-        WHERE ds.id = $1 AND p.user_id = $2""",
-        generation_id, current_user.get("id") if current_user else DEMO_USER_ID
-    )
-    
-    if not dream_session or not dream_session['generated_files']:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Generated code not found"
-        )
-    
     # Create ZIP file in memory
     import zipfile
     import io
     
     zip_buffer = io.BytesIO()
+    files_written = 0
     
+    # Unnest the files server-side and pull them through a cursor, so only a few
+    # files (not the whole generated_files document and the rest of the row) are
+    # held in Python at once
     with zipfile.ZipFile(zip_buffer, 'w', zipfile.ZIP_DEFLATED) as zip_file:
-        for file_data in json.loads(dream_session['generated_files'])['files']:
-            zip_file.writestr(file_data["filename"], file_data["content"])
+        async with db.transaction():
+            async for file_data in db.cursor(
+                """SELECT f->>'filename' AS filename, f->>'content' AS content
+                FROM dream_sessions ds
+                JOIN projects p ON ds.project_id = p.id
+                CROSS JOIN LATERAL jsonb_array_elements(ds.generated_files->'files') AS f
+                WHERE ds.id = $1 AND p.user_id = $2""",
+                generation_id, current_user.get("id") if current_user else DEMO_USER_ID,
+                prefetch=16
+            ):
+                zip_file.writestr(file_data["filename"], file_data["content"])
+                files_written += 1
+    
+    if not files_written:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Generated code not found"
+        )
     
     zip_buffer.seek(0)
     
+    # Stream the archive in 64KB chunks straight from the buffer instead of copying it whole
     return StreamingResponse(
-        io.BytesIO(zip_buffer.read()),
+        iter(lambda: zip_buffer.read(64 * 1024), b""),
         media_type="application/zip",
         headers={"Content-Disposition": f"attachment; filename=generated_code_{generation_id}.zip"}
     )
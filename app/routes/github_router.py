@@ -129,7 +129,7 @@ async def upload_generated_code_to_github(
             )
         
         # Upload to GitHub
-        repo_name = project.github_repo_url.split('/')[-1].replace('.git', '')
+        repo_name = project.github_repo_url.rpartition('/')[2].replace('.git', '')
         
         upload_result = await github_integration.upload_generated_code(
             repo_name=repo_name,
@@ -195,7 +195,7 @@ async def sync_debug_changes_to_github(
             )
         
         # Sync changes
-        repo_name = project.github_repo_url.split('/')[-1].replace('.git', '')
+        repo_name = project.github_repo_url.rpartition('/')[2].replace('.git', '')
         
         sync_result = await github_integration.sync_project_changes(
             repo_name=repo_name,
@@ -6,18 +6,17 @@ Transforms voice/text conversations into deployable applications
 
 from fastapi import APIRouter, Depends, HTTPException, status, File, UploadFile, Form
 from fastapi.responses import JSONResponse, StreamingResponse
-from typing import Dict, List, Optional, Any
-import json
+from typing import Dict, List, Optional, Any, Tuple
+from collections import OrderedDict
 import asyncio
-from datetime import datetime
 import uuid
 import asyncpg
 from app.services import service_manager
 
 from app.database.db import get_db
 from app.database.models import *
-from app.utils.voice_conversation_engine import VoiceConversationEngine, FounderType, ConversationState
-from app.utils.voice_processor import VoiceProcessor
+from app.utils.voice_conversation_engine import VoiceConversationEngine, FounderType, ConversationState, utc_now_iso
+from app.utils.voice_processor import VoiceProcessor, AUDIO_SNIFF_BYTES
 from app.utils.business_intelligence import BusinessIntelligence
 from app.utils.contract_method import ContractMethod
 from app.utils.logger import get_logger
@@ -36,6 +35,57 @@ security_validator = SecurityValidator()
 
 DEMO_USER_ID = "00000000-0000-0000-0000-000000000001"
 
+# Background transcription jobs: job_id -> (session_id, user_id, task), oldest first
+_transcription_jobs: "OrderedDict[str, Tuple[str, str, asyncio.Task]]" = OrderedDict()
+MAX_TRANSCRIPTION_JOBS = 512
+# Strong references to unfinished tasks - the event loop only holds weak ones, so a job
+# evicted from the registry must stay referenced here until it completes
+_running_transcriptions: "set[asyncio.Task]" = set()
+
+def _transcription_job_done(task: asyncio.Task):
+    """Drop a finished job's strong reference and surface any unexpected failure"""
+    _running_transcriptions.discard(task)
+    if not task.cancelled() and task.exception() is not None:
+        logger.log_structured("error", "Background transcription failed", {
+            "error": str(task.exception())
+        })
+
+async def _read_upload(upload: UploadFile) -> bytes:
+    """Read an upload into memory and release its spooled temp file right away"""
+    try:
+        return await upload.read()
+    finally:
+        await upload.close()
+
+async def _check_audio_upload(audio_file: UploadFile):
+    """Cheap upload checks (type, declared size, header sniff) before any database or API work"""
+    if not audio_file.content_type.startswith('audio/'):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Invalid audio file format: {audio_file.content_type}"
+        )
+    
+    # Reject oversized uploads from the spooled file's size, before buffering them in memory
+    max_file_size = service_manager.voice_processor.max_file_size
+    if audio_file.size is not None and audio_file.size > max_file_size:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"Audio file too large: {audio_file.size} bytes (max: {max_file_size})"
+        )
+    
+    # Sniff the container header so non-audio bodies are rejected without reading them
+    header = await audio_file.read(AUDIO_SNIFF_BYTES)
+    if not service_manager.voice_processor.looks_like_audio(header):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Uploaded file content is not a supported audio format"
+        )
+    await audio_file.seek(0)
+
+def _upload_format(audio_file: UploadFile) -> str:
+    """Audio format from the upload's MIME type, ignoring codec parameters"""
+    return audio_file.content_type.partition(';')[0].rpartition('/')[2]
+
 @router.post("/start-conversation", response_model=VoiceConversationResponse)
 async def start_ai_cofounder_conversation(
     request: VoiceConversationRequest,
@@ -50,7 +100,7 @@ async def start_ai_cofounder_conversation(
         user_email = current_user.get("email") if current_user else "demo@example.com"
 
         # ✅ FIX: Use fallback security validator if service_manager one is None
-        validator = service_manager.security_validator if service_manager.security_validator else SecurityValidator()
+        validator = service_manager.security_validator or security_validator
         
         # Validate and sanitize input
         security_issues = await validator.validate_input(request.initial_input)
@@ -84,7 +134,7 @@ async def start_ai_cofounder_conversation(
             conversation_id,
             session.session_id, 
             user_id, 
-            json.dumps(session.conversation_history),
+            session.conversation_history,
             session.founder_profile.type.value if session.founder_profile else "unknown",
             session.validation_requested,
             False,  # strategy_validated
@@ -133,13 +183,13 @@ async def process_conversation_turn(
     try:
         user_id = current_user.get("id") if current_user else DEMO_USER_ID
         
-        # Validate session ownership
-        db_conversation = await db.fetchrow(
-            "SELECT * FROM voice_conversations WHERE session_id = $1 AND user_id = $2",
+        # Validate session ownership (the stored history isn't needed - turns are appended in SQL)
+        session_exists = await db.fetchval(
+            "SELECT 1 FROM voice_conversations WHERE session_id = $1 AND user_id = $2",
             session_id, user_id
         )
 
-        if not db_conversation:
+        if not session_exists:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="Conversation session not found"
@@ -153,7 +203,7 @@ async def process_conversation_turn(
             )
         
         # ✅ FIX: Use fallback security validator if service_manager one is None
-        validator = service_manager.security_validator if service_manager.security_validator else SecurityValidator()
+        validator = service_manager.security_validator or security_validator
         
         # Validate input
         security_issues = await validator.validate_input(request.user_response)
@@ -168,26 +218,30 @@ async def process_conversation_turn(
             user_response=request.user_response
         )
         
-        # Update database
-        current_history = json.loads(db_conversation['conversation_history'])
-        updated_history = current_history + [
+        # Update database (one timestamp for the whole turn). Appending with || keeps
+        # concurrent turns on one session from overwriting each other, and only this
+        # turn's messages cross the wire instead of the whole history
+        # Same UTC, second-resolution format as the entries the conversation engine writes
+        turn_timestamp = utc_now_iso()
+        turn_messages = [
             {
                 "role": "user",
                 "content": request.user_response,
-                "timestamp": datetime.now().isoformat()
+                "timestamp": turn_timestamp
             },
             {
                 "role": "assistant", 
                 "content": response["ai_response"],
-                "timestamp": datetime.now().isoformat()
+                "timestamp": turn_timestamp
             }
         ]
         
         await db.execute(
             """UPDATE voice_conversations 
-               SET conversation_history = $1, conversation_state = $2, updated_at = NOW()
+               SET conversation_history = conversation_history || $1::jsonb,
+                   conversation_state = $2, updated_at = NOW()
                WHERE session_id = $3""",
-            json.dumps(updated_history), response["conversation_state"], session_id
+            turn_messages, response["conversation_state"], session_id
         )
         
         return ConversationTurnResponse(
@@ -230,33 +284,29 @@ async def transcribe_voice_input(
                 detail="Voice transcription service is not available. Please ensure OPENAI_API_KEY is configured."
             )
         
-        # Validate session
         user_id = current_user.get("id") if current_user else DEMO_USER_ID
-        db_conversation = await db.fetchrow(
-            "SELECT * FROM voice_conversations WHERE session_id = $1 AND user_id = $2",
+        
+        # Validate audio file - cheap checks first, before any database or API round-trip
+        await _check_audio_upload(audio_file)
+        
+        # Validate session (existence only - the stored history isn't needed here)
+        session_exists = await db.fetchval(
+            "SELECT 1 FROM voice_conversations WHERE session_id = $1 AND user_id = $2",
             session_id, user_id
         )
         
-        if not db_conversation:
+        if not session_exists:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="Conversation session not found"
             )
         
-        # Validate audio file
-        if not audio_file.content_type.startswith('audio/'):
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail=f"Invalid audio file format: {audio_file.content_type}"
-            )
-        
-        # Read audio data
-        audio_data = await audio_file.read()
-        
-        # Transcribe audio using initialized voice processor
+        # Transcribe audio using initialized voice processor (read inline so this
+        # frame doesn't keep the raw upload alive during the Whisper call, and the
+        # spooled copy is closed before it rather than at the end of the request)
         transcription_result = await service_manager.voice_processor.transcribe_audio(
-            audio_data=audio_data,
-            audio_format=audio_file.content_type.split('/')[-1]
+            audio_data=await _read_upload(audio_file),
+            audio_format=_upload_format(audio_file)
         )
         
         if not transcription_result.success:
@@ -265,9 +315,12 @@ async def transcribe_voice_input(
                 detail=f"Transcription failed: {transcription_result.error_message}"
             )
         
+        # The single summary event for this request
         logger.log_structured("info", "Voice transcription completed", {
             "session_id": session_id,
             "user_id": user_id,
+            "audio_bytes": audio_file.size,
+            "audio_format": _upload_format(audio_file),
             "processing_time": transcription_result.processing_time,
             "confidence": transcription_result.confidence
         })
@@ -279,6 +332,8 @@ async def transcribe_voice_input(
             session_id=session_id
         )
         
+    except HTTPException:
+        raise
     except Exception as e:
         logger.log_structured("error", "Voice transcription failed", {
             "session_id": session_id,
@@ -290,6 +345,103 @@ async def transcribe_voice_input(
             detail=f"Voice transcription failed: {str(e)}"
         )
 
+@router.post("/transcribe-audio/{session_id}/jobs", status_code=status.HTTP_202_ACCEPTED)
+async def submit_transcription_job(
+    session_id: str,
+    audio_file: UploadFile = File(...),
+    db: asyncpg.Connection = Depends(get_db),
+    current_user: Optional[Dict[str, Any]] = Depends(get_optional_current_user)
+):
+    """
+    Queue voice transcription and return immediately with a job ID
+    Poll /transcription-jobs/{job_id} for the result
+
+    Jobs are kept in this worker's memory only: with several workers the poll must reach
+    the same process (sticky routing), and jobs are lost on restart
+    """
+    
+    if not service_manager.voice_processor:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Voice transcription service is not available. Please ensure OPENAI_API_KEY is configured."
+        )
+    
+    user_id = current_user.get("id") if current_user else DEMO_USER_ID
+    await _check_audio_upload(audio_file)
+    
+    session_exists = await db.fetchval(
+        "SELECT 1 FROM voice_conversations WHERE session_id = $1 AND user_id = $2",
+        session_id, user_id
+    )
+    if not session_exists:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Conversation session not found"
+        )
+    
+    job_id = uuid.uuid4().hex
+    task = asyncio.create_task(service_manager.voice_processor.transcribe_audio(
+        audio_data=await _read_upload(audio_file),
+        audio_format=_upload_format(audio_file)
+    ))
+    _running_transcriptions.add(task)
+    task.add_done_callback(_transcription_job_done)
+    _transcription_jobs[job_id] = (session_id, str(user_id), task)
+    
+    # Forget the oldest jobs once the registry is full (a running task still completes,
+    # held by _running_transcriptions)
+    while len(_transcription_jobs) > MAX_TRANSCRIPTION_JOBS:
+        _transcription_jobs.popitem(last=False)
+    
+    return {"status": "queued", "job_id": job_id, "session_id": session_id}
+
+@router.get("/transcription-jobs/{job_id}")
+async def get_transcription_job(
+    job_id: str,
+    current_user: Optional[Dict[str, Any]] = Depends(get_optional_current_user)
+):
+    """Get the status, and once finished the result, of a queued transcription (this worker's jobs only)"""
+    
+    user_id = current_user.get("id") if current_user else DEMO_USER_ID
+    job = _transcription_jobs.get(job_id)
+    if job is None or job[1] != str(user_id):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Transcription job not found"
+        )
+    
+    session_id, _, task = job
+    if not task.done():
+        return {"status": "processing", "job_id": job_id, "session_id": session_id}
+    
+    if task.cancelled() or task.exception() is not None:
+        return {
+            "status": "failed",
+            "job_id": job_id,
+            "session_id": session_id,
+            "error_message": "Transcription did not complete"
+        }
+    
+    result = task.result()
+    if not result.success:
+        return {
+            "status": "failed",
+            "job_id": job_id,
+            "session_id": session_id,
+            "error_message": result.error_message
+        }
+    
+    return {
+        "status": "completed",
+        "job_id": job_id,
+        **VoiceTranscriptionResponse(
+            transcription=result.transcription,
+            confidence=result.confidence,
+            processing_time=result.processing_time,
+            session_id=session_id
+        ).model_dump()
+    }
+
 @router.post("/create-agreement/{session_id}")
 async def create_founder_ai_agreement(
     session_id: str,
@@ -302,14 +454,14 @@ async def create_founder_ai_agreement(
     """
     
     try:
-        # Validate session
+        # Validate session (existence only - the stored history isn't needed here)
         user_id = current_user.get("id") if current_user else DEMO_USER_ID
-        db_conversation = await db.fetchrow(
-            "SELECT * FROM voice_conversations WHERE session_id = $1 AND user_id = $2",
+        session_exists = await db.fetchval(
+            "SELECT 1 FROM voice_conversations WHERE session_id = $1 AND user_id = $2",
             session_id, user_id
         )
         
-        if not db_conversation:
+        if not session_exists:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="Conversation session not found"
@@ -330,7 +482,7 @@ async def create_founder_ai_agreement(
             """UPDATE voice_conversations 
                SET founder_ai_agreement = $1, conversation_state = $2, updated_at = NOW()
                WHERE session_id = $3""",
-            json.dumps(agreement), "agreement_created", session_id
+            agreement, "agreement_created", session_id
         )
         
         # Create project from agreement
@@ -346,8 +498,8 @@ async def create_founder_ai_agreement(
             project_name,
             user_id,
             session_id,
-            json.dumps(agreement),
-            json.dumps(agreement["ai_commitments"]["technology_stack"]),
+            agreement,
+            agreement["ai_commitments"]["technology_stack"],
             "planning"
         )
         
@@ -402,12 +554,12 @@ async def get_conversation_history(
     
     return ConversationHistoryResponse(
         session_id=session_id,
-        conversation_history=json.loads(db_conversation['conversation_history']),
+        conversation_history=db_conversation['conversation_history'],
         founder_type_detected=db_conversation['founder_type_detected'],
         conversation_state=db_conversation['conversation_state'],
         business_validation_requested=db_conversation['business_validation_requested'],
         strategy_validated=db_conversation['strategy_validated'],
-        founder_ai_agreement=json.loads(db_conversation['founder_ai_agreement']) if db_conversation['founder_ai_agreement'] else None
+        founder_ai_agreement=db_conversation['founder_ai_agreement'] or None
     )
 
 @router.get("/sessions")
@@ -430,7 +582,7 @@ async def get_user_conversation_sessions(
     
     sessions = []
     for conv in conversations:
-        history = json.loads(conv['conversation_history'])
+        history = conv['conversation_history']
         last_message = history[-1]["content"] if history else None
         
         sessions.append({
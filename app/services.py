@@ -86,6 +86,18 @@ class ServiceManager:
             # Voice processing
             'elevenlabs_api_key': os.getenv('ELEVENLABS_API_KEY'),
             'voice_timeout': int(os.getenv('VOICE_TIMEOUT', '60')),
+            'voice_max_concurrency': int(os.getenv('VOICE_MAX_CONCURRENCY', '8')),
+            'voice_rate_limit_rpm': int(os.getenv('VOICE_RATE_LIMIT_RPM', '50')),
+            'voice_strict_validation': os.getenv('VOICE_STRICT_VALIDATION', 'false').lower() == 'true',
+            'voice_batch_concurrency': int(os.getenv('VOICE_CONCURRENCY', '3')),
+            'voice_backend': os.getenv('VOICE_BACKEND', 'openai_api'),
+            'whisper_local_model': os.getenv('WHISPER_LOCAL_MODEL', 'base'),
+            'whisper_model': os.getenv('WHISPER_MODEL') or os.getenv('OPENAI_VOICE_MODEL', 'whisper-1'),
+            'whisper_language': os.getenv('WHISPER_LANGUAGE') or None,
+            'voice_transcode': os.getenv('VOICE_TRANSCODE', 'true').lower() == 'true',
+            'voice_coalesce_short_clips': os.getenv('VOICE_COALESCE_SHORT_CLIPS', 'false').lower() == 'true',
+            'voice_cache_max_entries': int(os.getenv('VOICE_CACHE_MAX_ENTRIES', '1024')),
+            'voice_cache_redis': os.getenv('VOICE_CACHE_REDIS', 'false').lower() == 'true',
             
             # GitHub integration
             'github_token': os.getenv('GITHUB_TOKEN'),
@@ -214,11 +226,29 @@ class ServiceManager:
         """Initialize voice processing and conversation engine"""
         try:
             if config['openai_api_key']:
+                voice_cache_redis = None
+                if config['voice_cache_redis']:
+                    import redis.asyncio
+                    voice_cache_redis = redis.asyncio.from_url(os.getenv('REDIS_URL', 'redis://localhost:6379/0'))
+                
                 self.voice_processor = VoiceProcessor(
-                    openai_api_key=config['openai_api_key']
+                    openai_api_key=config['openai_api_key'],
+                    max_concurrency=config['voice_max_concurrency'],
+                    requests_per_minute=config['voice_rate_limit_rpm'],
+                    cache_max_entries=config['voice_cache_max_entries'],
+                    redis_client=voice_cache_redis,
+                    batch_concurrency=config['voice_batch_concurrency'],
+                    backend=config['voice_backend'],
+                    local_model=config['whisper_local_model'],
+                    whisper_model=config['whisper_model'],
+                    language=config['whisper_language'],
+                    transcode=config['voice_transcode'],
+                    coalesce_short_clips=config['voice_coalesce_short_clips']
                 )
                 # ✅ FIX: Check initialization return value
-                init_result = await self.voice_processor.initialize()
+                init_result = await self.voice_processor.initialize(
+                    strict_validation=config['voice_strict_validation']
+                )
                 if not init_result:
                     logger.error("Voice processor failed initialization test")
                     self.voice_processor = None
@@ -415,6 +445,14 @@ class ServiceManager:
         if hasattr(self, 'db_pool') and self.db_pool:
             await self.db_pool.close()
             logger.info("✅ Database pool closed")
+        
+        if self.voice_processor:
+            await self.voice_processor.close()
+            logger.info("✅ Voice processor HTTP client closed")
+        
+        if self.llm_provider:
+            await self.llm_provider.close()
+            logger.info("✅ LLM provider HTTP clients closed")
     
         # Add other cleanup as needed
         logger.info("✅ Cleanup complete")
@@ -6,8 +6,6 @@ Real market analysis, competitor research, business model validation
 
 import asyncio
 import json
-import openai
-import requests
 from typing import Dict, List, Optional, Tuple
 from datetime import datetime
 import re
@@ -283,7 +281,7 @@ class BusinessIntelligence:
         improvement_prompt = f"""
         Analyze this business strategy and suggest specific improvements:
         
-        Current Strategy: {json.dumps(current_strategy, indent=2)}
+        Current Strategy: {json.dumps(current_strategy)}
         
         Provide improvement suggestions for:
         1. Business model optimization
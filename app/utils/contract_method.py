@@ -6,6 +6,7 @@ Ensures AI agents comply with founder agreements and detect deviations
 
 import asyncio
 import json
+import orjson
 import uuid
 from typing import Dict, List, Optional, Any, Tuple
 from datetime import datetime, timedelta
@@ -239,12 +240,12 @@ class ContractMethod:
         Analyze this AI output against the founder contract requirements:
         
         Contract Requirements:
-        - Business: {json.dumps(contract.business_requirements, indent=2)}
-        - Technical: {json.dumps(contract.technical_specifications, indent=2)}
-        - Success Criteria: {json.dumps(contract.success_criteria, indent=2)}
+        - Business: {json.dumps(contract.business_requirements)}
+        - Technical: {json.dumps(contract.technical_specifications)}
+        - Success Criteria: {json.dumps(contract.success_criteria)}
         
         AI Output:
-        {json.dumps(ai_output, indent=2)}
+        {json.dumps(ai_output)}
         
         Evaluate compliance on:
         1. Feature completeness (all required features included)
@@ -280,7 +281,7 @@ class ContractMethod:
                 temperature=0.1
             )
             
-            return json.loads(response)
+            return orjson.loads(response)
             
         except Exception as e:
             return {
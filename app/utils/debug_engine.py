@@ -5,7 +5,7 @@ Enhanced with real-time collaboration and GitHub sync
 """
 
 import asyncio
-import json
+import orjson
 import uuid
 import ast
 import re
@@ -14,6 +14,24 @@ from datetime import datetime
 from dataclasses import dataclass
 import openai
 
+# Common debugging topics, compiled into one alternation with a named group per
+# topic so conversation text is scanned once rather than once per keyword
+_TOPIC_KEYWORDS = {
+    "bug_fixing": ("bug", "error", "issue", "problem", "fix"),
+    "performance": ("slow", "performance", "optimize", "speed"),
+    "testing": ("test", "testing", "unit test", "integration"),
+    "refactoring": ("refactor", "clean", "organize", "structure"),
+    "features": ("add", "feature", "implement", "new"),
+    "security": ("security", "vulnerability", "secure", "auth")
+}
+_TOPIC_KEYWORD_RE = re.compile("|".join(
+    f"(?P<{topic}>" + "|".join(map(re.escape, sorted(keywords, key=len, reverse=True))) + ")"
+    for topic, keywords in _TOPIC_KEYWORDS.items()
+))
+
+# Issue severities that get an immediate fix suggestion
+_PRIORITY_SEVERITIES = frozenset({"critical", "high"})
+
 @dataclass
 class CodeAnalysis:
     file_path: str
@@ -83,19 +101,24 @@ class DebugEngine:
     async def _analyze_codebase(self, codebase: Dict) -> List[CodeAnalysis]:
         """Comprehensive codebase analysis"""
         
-        analysis_results = []
+        # Each file is an independent LLM round-trip, so analyze a few at a time
+        # (results keep the codebase's file order)
+        semaphore = asyncio.Semaphore(5)
         
-        for file_path, file_content in codebase.items():
-            if file_path.endswith(('.py', '.js', '.ts', '.jsx', '.tsx')):
-                analysis = await self._analyze_file(file_path, file_content)
-                analysis_results.append(analysis)
+        async def analyze(file_path: str, file_content: str) -> CodeAnalysis:
+            async with semaphore:
+                return await self._analyze_file(file_path, file_content)
         
-        return analysis_results
+        return list(await asyncio.gather(*(
+            analyze(file_path, file_content)
+            for file_path, file_content in codebase.items()
+            if file_path.endswith(('.py', '.js', '.ts', '.jsx', '.tsx'))
+        )))
     
     async def _analyze_file(self, file_path: str, file_content: str) -> CodeAnalysis:
         """Analyze individual file for issues and improvements"""
         
-        file_extension = file_path.split('.')[-1]
+        file_extension = file_path.rpartition('.')[2]
         
         analysis_prompt = f"""
         Analyze this {file_extension} file for issues and improvements:
@@ -145,7 +168,7 @@ class DebugEngine:
                 temperature=0.1
             )
             
-            result = json.loads(response)
+            result = orjson.loads(response)
             
             return CodeAnalysis(
                 file_path=file_path,
@@ -178,11 +201,12 @@ class DebugEngine:
         suggestions = []
         
         # Priority: Critical and high severity issues first
-        critical_issues = []
-        for analysis in analysis_results:
-            for issue in analysis.issues_found:
-                if issue["severity"] in ["critical", "high"]:
-                    critical_issues.append((analysis.file_path, issue))
+        critical_issues = [
+            (analysis.file_path, issue)
+            for analysis in analysis_results
+            for issue in analysis.issues_found
+            if issue["severity"] in _PRIORITY_SEVERITIES
+        ]
         
         # Generate suggestions for critical issues
         for file_path, issue in critical_issues:
@@ -314,7 +338,7 @@ class DebugEngine:
                 temperature=0.2
             )
             
-            return json.loads(response)
+            return orjson.loads(response)
             
         except Exception as e:
             return {
@@ -334,14 +358,17 @@ class DebugEngine:
     async def _summarize_analysis_results(self, analysis_results: List[CodeAnalysis]) -> str:
         """Summarize analysis results for context"""
         
-        total_issues = sum(len(analysis.issues_found) for analysis in analysis_results)
-        avg_quality = sum(analysis.quality_score for analysis in analysis_results) / len(analysis_results) if analysis_results else 0
-        
+        # One pass over the results for totals, quality and the type breakdown
+        total_issues = 0
+        quality_total = 0
         issue_types = {}
         for analysis in analysis_results:
+            total_issues += len(analysis.issues_found)
+            quality_total += analysis.quality_score
             for issue in analysis.issues_found:
                 issue_type = issue["type"]
                 issue_types[issue_type] = issue_types.get(issue_type, 0) + 1
+        avg_quality = quality_total / len(analysis_results) if analysis_results else 0
         
         return f"Found {total_issues} total issues. Average quality score: {avg_quality:.2f}. Issue breakdown: {issue_types}"
     
@@ -408,15 +435,17 @@ class DebugEngine:
         
         # Calculate overall metrics
         total_files = len(session.codebase_snapshot)
-        total_issues = sum(len(analysis.issues_found) for analysis in session.analysis_results)
-        avg_quality = sum(analysis.quality_score for analysis in session.analysis_results) / len(session.analysis_results) if session.analysis_results else 0
-        
-        # Group issues by severity
+        # Totals, quality and severity grouping in one pass over the results
+        total_issues = 0
+        quality_total = 0
         issues_by_severity = {"critical": 0, "high": 0, "medium": 0, "low": 0}
         for analysis in session.analysis_results:
+            total_issues += len(analysis.issues_found)
+            quality_total += analysis.quality_score
             for issue in analysis.issues_found:
                 severity = issue.get("severity", "low")
                 issues_by_severity[severity] += 1
+        avg_quality = quality_total / len(session.analysis_results) if session.analysis_results else 0
         
         return {
             "session_id": session_id,
@@ -484,22 +513,12 @@ class DebugEngine:
         """Extract key topics from conversation history"""
         
         # Simple keyword extraction - can be enhanced with NLP
-        user_messages = [msg["content"] for msg in conversation_history if msg["role"] == "user"]
-        combined_text = " ".join(user_messages).lower()
-        
-        # Common debugging topics
-        topics = []
-        topic_keywords = {
-            "bug_fixing": ["bug", "error", "issue", "problem", "fix"],
-            "performance": ["slow", "performance", "optimize", "speed"],
-            "testing": ["test", "testing", "unit test", "integration"],
-            "refactoring": ["refactor", "clean", "organize", "structure"],
-            "features": ["add", "feature", "implement", "new"],
-            "security": ["security", "vulnerability", "secure", "auth"]
-        }
+        combined_text = " ".join(
+            msg["content"] for msg in conversation_history if msg["role"] == "user"
+        ).lower()
         
-        for topic, keywords in topic_keywords.items():
-            if any(keyword in combined_text for keyword in keywords):
-                topics.append(topic.replace("_", " ").title())
+        # One scan of the combined text finds every topic mentioned
+        found = {match.lastgroup for match in _TOPIC_KEYWORD_RE.finditer(combined_text)}
+        topics = [topic.replace("_", " ").title() for topic in _TOPIC_KEYWORDS if topic in found]
         
         return topics if topics else ["General debugging"]
\ No newline at end of file
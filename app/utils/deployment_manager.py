@@ -7,7 +7,7 @@ Enhanced with monitoring and rollback capabilities
 import asyncio
 import json
 import subprocess
-from typing import Dict, List, Optional, Any
+from typing import Any, ClassVar, Dict, FrozenSet, List, Optional
 from datetime import datetime
 from dataclasses import dataclass
 
@@ -29,8 +29,7 @@ class DeploymentResult:
 class DeploymentManager:
     """Automated deployment orchestration"""
     
-    def __init__(self):
-        self.supported_platforms = ["heroku", "vercel", "netlify", "aws"]
+    SUPPORTED_PLATFORMS: ClassVar[FrozenSet[str]] = frozenset({"heroku", "vercel", "netlify", "aws"})
         
     async def deploy_project(self, 
                            project_code: Dict[str, str],
@@ -5,18 +5,37 @@ Enhanced with business intelligence integration
 """
 
 import asyncio
-import json
+import orjson
 import uuid
 import os
-import tempfile
-import zipfile
 from typing import Dict, List, Optional, Any, Tuple
 from datetime import datetime
 import openai
 from dataclasses import dataclass
+from functools import lru_cache
 import re
-import uuid
-from datetime import datetime
+
+# Project type indicators in priority order, compiled so a description is scanned once
+_PROJECT_TYPE_KEYWORDS = {
+    "marketplace": ("marketplace", "booking", "reservation"),
+    "ecommerce": ("e-commerce", "shop", "store", "product"),
+    "social": ("social", "community", "chat", "messaging"),
+    "analytics": ("analytics", "dashboard", "reporting"),
+    "api_service": ("api", "integration", "webhook")
+}
+_PROJECT_TYPE_RE = re.compile("|".join(
+    f"(?P<{project_type}>" + "|".join(map(re.escape, keywords)) + ")"
+    for project_type, keywords in _PROJECT_TYPE_KEYWORDS.items()
+))
+
+@lru_cache(maxsize=512)
+def _classify_project_type(solution: str) -> str:
+    """Highest-priority project type mentioned in a lowercased solution description"""
+    matched = {match.lastgroup for match in _PROJECT_TYPE_RE.finditer(solution)}
+    return next(
+        (project_type for project_type in _PROJECT_TYPE_KEYWORDS if project_type in matched),
+        "web_application"
+    )
 
 @dataclass
 class StrategicAnalysis:
@@ -142,7 +161,7 @@ class DreamEngine:
                 temperature=0.2
             )
             
-            analysis_data = json.loads(response)
+            analysis_data = orjson.loads(response)
             
             return StrategicAnalysis(
                 business_context=analysis_data["business_context"],
@@ -252,20 +271,7 @@ class DreamEngine:
     async def _determine_project_type(self, business_spec: Dict) -> str:
         """Determine project type from business specification"""
         
-        solution = business_spec.get("solution_description", "").lower()
-        
-        if any(keyword in solution for keyword in ["marketplace", "booking", "reservation"]):
-            return "marketplace"
-        elif any(keyword in solution for keyword in ["e-commerce", "shop", "store", "product"]):
-            return "ecommerce"
-        elif any(keyword in solution for keyword in ["social", "community", "chat", "messaging"]):
-            return "social"
-        elif any(keyword in solution for keyword in ["analytics", "dashboard", "reporting"]):
-            return "analytics"
-        elif any(keyword in solution for keyword in ["api", "integration", "webhook"]):
-            return "api_service"
-        else:
-            return "web_application"
+        return _classify_project_type(business_spec.get("solution_description", "").lower())
     
     async def _generate_backend_files(self, 
                                     strategic_analysis: StrategicAnalysis,
@@ -763,16 +769,6 @@ async def get_analytics_summary(
     }}
 '''
 
-    async def _load_generation_templates(self) -> Dict:
-        """Load code generation templates"""
-        return {
-            "fastapi_main": "FastAPI main application template",
-            "react_app": "React application template",
-            "database_models": "SQLAlchemy models template",
-            "api_routes": "FastAPI routes template",
-            "auth_system": "Authentication system template"
-        }
-    
     # Additional methods for generating other file types...
     # (Continuing with remaining backend generation methods)
     
@@ -12,8 +12,6 @@ from typing import Dict, List, Optional, Any
 from datetime import datetime
 from dataclasses import dataclass
 from github import Github
-import tempfile
-import zipfile
 
 @dataclass
 class GitHubRepository:
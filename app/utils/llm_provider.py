@@ -6,6 +6,7 @@ Enhanced with rate limiting and cost optimization
 
 import asyncio
 import openai
+import orjson
 import anthropic
 import os
 from typing import Dict, List, Optional, Any
@@ -41,11 +42,18 @@ class EnhancedLLMProvider:
         
         self.anthropic_client = anthropic.AsyncAnthropic(api_key=api_keys.get("anthropic")) if api_keys.get("anthropic") else None
         
+        import httpx
+        
         # ADD THE OPENAI CLIENT LINE HERE:
-        self.openai_client = openai.AsyncOpenAI(api_key=api_keys.get("openai")) if api_keys.get("openai") else None
+        # One pooled connection set for every completion instead of the SDK's small default pool
+        self.openai_client = openai.AsyncOpenAI(
+            api_key=api_keys.get("openai"),
+            http_client=openai.DefaultAsyncHttpxClient(
+                limits=httpx.Limits(max_connections=100, max_keepalive_connections=20)
+            )
+        ) if api_keys.get("openai") else None
         
         # KimiDev client சேர்க்கவும்
-        import httpx
         self.kimidev_client = httpx.AsyncClient(
             base_url="https://openrouter.ai/api/v1",
             headers={
@@ -54,7 +62,12 @@ class EnhancedLLMProvider:
                 "HTTP-Referer": "https://mydreamengine.com",
                 "X-Title": "MyDreamEngine"
             },
-            timeout=60.0
+            timeout=60.0,
+            # Keep warm connections to OpenRouter and retry failed connects
+            transport=httpx.AsyncHTTPTransport(
+                retries=3,
+                limits=httpx.Limits(max_connections=50, max_keepalive_connections=10)
+            )
         ) if api_keys.get("openrouter") else None
         
         self.providers = [LLMProvider.KIMIDEV, LLMProvider.OPENAI, LLMProvider.ANTHROPIC]
@@ -76,6 +89,18 @@ class EnhancedLLMProvider:
             logging.error(f"❌ LLM Provider initialization failed: {e}")
             raise
         
+    async def close(self):
+        """Close the pooled HTTP connections behind each provider client"""
+        # SDK clients expose close(); the raw httpx client for KimiDev uses aclose()
+        closers = [client.close for client in (self.openai_client, self.anthropic_client) if client]
+        if self.kimidev_client:
+            closers.append(self.kimidev_client.aclose)
+        for close in closers:
+            try:
+                await close()
+            except Exception as e:
+                logging.warning(f"LLM client close failed: {e}")
+        
     async def generate_completion(self, 
                                 prompt: str,
                                 model: str = "auto",
@@ -100,7 +125,7 @@ class EnhancedLLMProvider:
                         }
                     )
                     response.raise_for_status()
-                    response_data = response.json()
+                    response_data = orjson.loads(response.content)
                     
                     # Enhanced error handling
                     if "choices" not in response_data or not response_data["choices"]:
@@ -189,6 +214,3 @@ class EnhancedLLMProvider:
             "status": "completed"
         }
 
-# Create the global instance that main.py expects
-llm_provider = EnhancedLLMProvider()
-
@@ -3,11 +3,52 @@ Enhanced Logger - Production-Ready Centralized Logging
 Comprehensive logging with structured output and monitoring integration
 """
 
+import atexit
+import copy
 import logging
-import json
+import orjson
+import queue
+import sys
 from datetime import datetime
+from logging.handlers import QueueHandler, QueueListener
 from typing import Dict, Any, Optional
 
+# log_structured level names -> stdlib levels (unknown names log at DEBUG)
+_STRUCTURED_LEVELS = {"error": logging.ERROR, "warning": logging.WARNING, "info": logging.INFO}
+
+class _ListenerFormattedQueueHandler(QueueHandler):
+    """QueueHandler that leaves the formatter (timestamp, layout, traceback) to the listener thread"""
+    
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # QueueHandler.prepare() would run the full format() here on the caller's thread.
+        # Only the %-args are merged now, since they may be mutated once the call returns.
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        return record
+
+# Every EnhancedLogger enqueues records here; one background thread does the stdout writes
+_log_queue: "queue.SimpleQueue[logging.LogRecord]" = queue.SimpleQueue()
+_queue_handler = _ListenerFormattedQueueHandler(_log_queue)
+_queue_listener: Optional[QueueListener] = None
+
+# EnhancedLogger per service name, built once and handed out by get_logger
+_loggers: Dict[str, "EnhancedLogger"] = {}
+
+def _get_queue_handler() -> QueueHandler:
+    """Shared non-blocking handler, starting its writer thread on first use"""
+    global _queue_listener
+    if _queue_listener is None:
+        console_handler = logging.StreamHandler(sys.stdout)
+        console_handler.setFormatter(logging.Formatter(
+            '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+        ))
+        _queue_listener = QueueListener(_log_queue, console_handler, respect_handler_level=True)
+        _queue_listener.start()
+        # Flush whatever is still queued when the process exits
+        atexit.register(_queue_listener.stop)
+    return _queue_handler
+
 class EnhancedLogger:
     """Production-ready structured logging system"""
     
@@ -16,37 +57,29 @@ class EnhancedLogger:
         self.logger = logging.getLogger(service_name)
         self._setup_logger()
         
-    def info(self, message):
-        print(f"[INFO] {message}")
-        return self.logger.info(message)
+    # Extra args are %-formatted only if the record is actually emitted
+    def info(self, message, *args):
+        return self.logger.info(message, *args)
     
-    def error(self, message):
-        print(f"[ERROR] {message}")
-        return self.logger.error(message)
+    def error(self, message, *args, exc_info=False):
+        return self.logger.error(message, *args, exc_info=exc_info)
 
-    def warning(self, message):
-        print(f"[WARNING] {message}")
-        return self.logger.warning(message)
+    def warning(self, message, *args):
+        return self.logger.warning(message, *args)
 
-    def debug(self, message):
-        print(f"[DEBUG] {message}")
-        return self.logger.debug(message)
+    def debug(self, message, *args):
+        return self.logger.debug(message, *args)
     
     def _setup_logger(self):
         """Setup structured logging"""
         # Prevent duplicate handlers
         if self.logger.hasHandlers():
             self.logger.handlers.clear()
-        # Create formatter
-        formatter = logging.Formatter(
-            '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-        )
-        # Console handler (stdout)
-        import sys
-        console_handler = logging.StreamHandler(sys.stdout)
-        console_handler.setFormatter(formatter)
-        # Add handlers
-        self.logger.addHandler(console_handler)
+        # The request path merges the message and enqueues; the formatter and the stdout
+        # write run on the listener thread
+        self.logger.addHandler(_get_queue_handler())
+        # stdout already gets every record once, so don't repeat it through the root handler
+        self.logger.propagate = False
         self.logger.setLevel(logging.DEBUG)
     
     def log_structured(self, 
@@ -55,6 +88,11 @@ class EnhancedLogger:
                       context: Dict[str, Any] = None):
         """Log structured message with context"""
         
+        # Skip building and serializing the entry when the level is filtered out
+        levelno = _STRUCTURED_LEVELS.get(level, logging.DEBUG)
+        if not self.logger.isEnabledFor(levelno):
+            return
+        
         log_entry = {
             "timestamp": datetime.now().isoformat(),
             "service": self.service_name,
@@ -63,16 +101,7 @@ class EnhancedLogger:
             "context": context or {}
         }
         
-        log_message = json.dumps(log_entry)
-        
-        if level == "error":
-            self.logger.error(log_message)
-        elif level == "warning":
-            self.logger.warning(log_message)
-        elif level == "info":
-            self.logger.info(log_message)
-        else:
-            self.logger.debug(log_message)
+        self.logger.log(levelno, orjson.dumps(log_entry, default=str, option=orjson.OPT_NON_STR_KEYS).decode())
 
 def setup_logger(service_name: str = "ai_debugger_factory") -> EnhancedLogger:
     """Setup and return enhanced logger"""
@@ -80,10 +109,18 @@ def setup_logger(service_name: str = "ai_debugger_factory") -> EnhancedLogger:
 
 def get_logger(service_name: str = "ai_debugger_factory") -> EnhancedLogger:
     """Get existing logger instance"""
-    return EnhancedLogger(service_name)
+    logger = _loggers.get(service_name)
+    if logger is None:
+        logger = _loggers[service_name] = EnhancedLogger(service_name)
+    return logger
 
 async def log_request_response(method, url, status_code, process_time, user_agent=None, ip_address=None):
     """Log request and response details with correct signature"""
+    logger = get_logger("api_requests")
+    is_error = status_code >= 400
+    if not logger.logger.isEnabledFor(logging.ERROR if is_error else logging.INFO):
+        return
+    
     log_data = {
         "method": method,
         "url": url,
@@ -93,16 +130,7 @@ async def log_request_response(method, url, status_code, process_time, user_agen
         "ip": ip_address or ""
     }
     
-    logger = get_logger("api_requests")
-    if status_code >= 400:
-        logger.error(f"API Error: {log_data}")
+    if is_error:
+        logger.error("API Error: %s", log_data)
     else:
-        logger.info(f"API Request: {log_data}")
-
-# Also add to EnhancedLogger class:
-def error(self, message, exc_info=False):
-        """Error logging with exc_info support"""
-        if exc_info:
-            import traceback
-            message += f"\n{traceback.format_exc()}"
-        return self.logger.error(message)
\ No newline at end of file
+        logger.info("API Request: %s", log_data)
@@ -5,7 +5,6 @@ Enhanced with comprehensive project lifecycle management
 """
 
 import asyncio
-import json
 import uuid
 from typing import Dict, List, Optional, Any
 from datetime import datetime
@@ -93,6 +92,6 @@ class ProjectManager:
             """, 
             metadata.project_id, metadata.project_name, metadata.description,
             metadata.founder_id, metadata.status.value,
-            json.dumps(state.layer_1_data), json.dumps(state.layer_2_data),
-            json.dumps(state.github_integration), json.dumps(state.deployment_info),
-            json.dumps(state.smart_contract_info), metadata.created_at, metadata.last_modified)
\ No newline at end of file
+            state.layer_1_data, state.layer_2_data,
+            state.github_integration, state.deployment_info,
+            state.smart_contract_info, metadata.created_at, metadata.last_modified)
\ No newline at end of file
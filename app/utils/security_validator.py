@@ -10,6 +10,18 @@ import json
 from typing import Dict, List, Optional, Any
 from dataclasses import dataclass
 
+# Dangerous calls flagged in generated code, compiled once for every scan
+_DANGEROUS_CODE_PATTERNS = tuple(
+    (re.compile(pattern), severity, description)
+    for pattern, severity, description in (
+        (r"eval\s*\(", "critical", "Use of eval() function"),
+        (r"exec\s*\(", "critical", "Use of exec() function"),
+        (r"os\.system\s*\(", "high", "Use of os.system()"),
+        (r"subprocess\.call\s*\(", "medium", "Use of subprocess.call()"),
+    )
+)
+_DANGEROUS_CODE_SCREEN = re.compile("|".join(pattern.pattern for pattern, _, _ in _DANGEROUS_CODE_PATTERNS))
+
 @dataclass
 class SecurityIssue:
     severity: str  # "low", "medium", "high", "critical"
@@ -23,6 +35,14 @@ class SecurityValidator:
     
     def __init__(self):
         self.security_patterns = self._load_security_patterns()
+        # One combined scan screens out clean input (the common case) before any
+        # per-pattern search runs
+        input_patterns = self.security_patterns["sql_injection"] + self.security_patterns["xss"]
+        self._input_screen = re.compile("|".join(f"(?:{pattern})" for pattern in input_patterns), re.IGNORECASE)
+        self._compiled_patterns = {
+            category: [re.compile(pattern, re.IGNORECASE) for pattern in patterns]
+            for category, patterns in self.security_patterns.items()
+        }
         
     def _load_security_patterns(self) -> Dict:
         """Load security threat patterns"""
@@ -49,9 +69,12 @@ class SecurityValidator:
         
         issues = []
         
+        if not self._input_screen.search(user_input):
+            return issues
+        
         # Check for SQL injection
-        for pattern in self.security_patterns["sql_injection"]:
-            if re.search(pattern, user_input, re.IGNORECASE):
+        for pattern in self._compiled_patterns["sql_injection"]:
+            if pattern.search(user_input):
                 issues.append(SecurityIssue(
                     severity="high",
                     category="sql_injection",
@@ -61,8 +84,8 @@ class SecurityValidator:
                 ))
         
         # Check for XSS
-        for pattern in self.security_patterns["xss"]:
-            if re.search(pattern, user_input, re.IGNORECASE):
+        for pattern in self._compiled_patterns["xss"]:
+            if pattern.search(user_input):
                 issues.append(SecurityIssue(
                     severity="medium",
                     category="xss",
@@ -78,16 +101,12 @@ class SecurityValidator:
         
         issues = []
         
-        # Check for dangerous functions
-        dangerous_patterns = [
-            (r"eval\s*\(", "critical", "Use of eval() function"),
-            (r"exec\s*\(", "critical", "Use of exec() function"),
-            (r"os\.system\s*\(", "high", "Use of os.system()"),
-            (r"subprocess\.call\s*\(", "medium", "Use of subprocess.call()"),
-        ]
+        # Check for dangerous functions (one screening pass, then per-pattern only on a hit)
+        if not _DANGEROUS_CODE_SCREEN.search(code):
+            return issues
         
-        for pattern, severity, description in dangerous_patterns:
-            if re.search(pattern, code):
+        for pattern, severity, description in _DANGEROUS_CODE_PATTERNS:
+            if pattern.search(code):
                 issues.append(SecurityIssue(
                     severity=severity,
                     category="dangerous_function",
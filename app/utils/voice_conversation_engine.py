@@ -4,15 +4,15 @@ Transforms natural founder conversations into deployable applications
 PATENT-WORTHY INNOVATION: Natural business conversations → deployed code
 """
 
-import asyncio
 import json
 import uuid
-from typing import Dict, List, Optional, Tuple, Any
-from datetime import datetime
-import openai
+from typing import Dict, List, Optional, Set, Tuple
+from datetime import datetime, timezone
 from dataclasses import dataclass
+from functools import lru_cache
 from enum import Enum
 import re
+import time
 
 class FounderType(Enum):
     TECHNICAL = "technical"
@@ -28,6 +28,125 @@ class ConversationState(Enum):
     CODE_GENERATION = "code_generation"
     COMPLETED = "completed"
 
+# (second, isoformat) of the last formatted timestamp - history entries only need
+# second resolution, so one format per second serves every turn in that second
+_ts_cache = [0, ""]
+
+def utc_now_iso() -> str:
+    """Current UTC time as an ISO string (with offset), cached at one-second granularity.
+
+    Every conversation_history timestamp comes from here so the stored entries sort consistently.
+    """
+    now = int(time.time())
+    if now != _ts_cache[0]:
+        _ts_cache[1] = datetime.fromtimestamp(now, timezone.utc).isoformat()
+        _ts_cache[0] = now
+    return _ts_cache[1]
+
+class _KeywordGroups:
+    """Named keyword groups found in one regex scan, with the same results as a `keyword in text`
+    test per keyword - nested and overlapping keywords (e.g. "market" in "marketing") all count"""
+    
+    def __init__(self, groups: Dict[str, Tuple[str, ...]]):
+        self.groups = {name: frozenset(keywords) for name, keywords in groups.items()}
+        keywords = sorted({keyword for group in groups.values() for keyword in group}, key=len, reverse=True)
+        # Zero-width lookahead, so every position is tried and yields the longest keyword starting there
+        self._pattern = re.compile("(?=(" + "|".join(map(re.escape, keywords)) + "))")
+        # Any other keyword starting at that position is a prefix of the longest one
+        self._prefixes = {
+            keyword: frozenset(prefix for prefix in keywords if keyword.startswith(prefix))
+            for keyword in keywords
+        }
+    
+    def keywords_in(self, text: str) -> Set[str]:
+        """Every keyword occurring in the (already lowercased) text"""
+        found = set()
+        for longest in set(self._pattern.findall(text)):
+            found |= self._prefixes[longest]
+        return found
+    
+    def groups_in(self, text: str) -> Set[str]:
+        """Names of the groups with at least one keyword in the text"""
+        found = self.keywords_in(text)
+        return {name for name, keywords in self.groups.items() if not keywords.isdisjoint(found)}
+
+# Founder-type indicators, compiled so a message is scanned once instead of once per keyword
+_FOUNDER_KEYWORDS = {
+    FounderType.TECHNICAL: (
+        "api", "database", "react", "python", "javascript", "backend", 
+        "frontend", "microservices", "docker", "kubernetes", "aws", "gcp",
+        "stripe integration", "authentication", "jwt", "oauth"
+    ),
+    FounderType.BUSINESS: (
+        "market", "customers", "revenue", "monetization", "business model",
+        "user acquisition", "marketing", "sales", "fundraising", "investors",
+        "problem solving", "customer pain", "market size"
+    ),
+}
+_FOUNDER_KEYWORD_GROUPS = _KeywordGroups({
+    founder_type.value: keywords for founder_type, keywords in _FOUNDER_KEYWORDS.items()
+})
+
+# Conversation state transition phrases
+_CODING_TRIGGERS = ("start coding", "generate code")
+_VALIDATION_TRIGGERS = ("validate", "business")
+_AGREEMENT_TRIGGERS = ("yes", "agree", "sounds good")
+_TRANSITION_TRIGGER_GROUPS = _KeywordGroups({
+    "coding": _CODING_TRIGGERS,
+    "validation": _VALIDATION_TRIGGERS,
+    "agreement": _AGREEMENT_TRIGGERS
+})
+
+# Features every generated application gets
+_BASE_FEATURES = (
+    "User authentication and authorization",
+    "Responsive web interface", 
+    "RESTful API backend",
+    "Database integration",
+    "Security implementation",
+    "Error handling and logging",
+    "API documentation"
+)
+
+# (solution keywords, extra features) added when the solution mentions any keyword
+_SOLUTION_FEATURE_BUNDLES = (
+    (("marketplace", "booking"), (
+        "User profiles and ratings",
+        "Booking/scheduling system",
+        "Payment processing integration",
+        "Notification system",
+        "Search and filtering"
+    )),
+    (("e-commerce", "shop"), (
+        "Product catalog management",
+        "Shopping cart functionality", 
+        "Order processing system",
+        "Inventory management",
+        "Payment gateway integration"
+    )),
+    (("social", "community"), (
+        "Social authentication",
+        "User-generated content",
+        "Real-time messaging",
+        "Feed/timeline functionality",
+        "Content moderation"
+    )),
+)
+_SOLUTION_FEATURE_GROUPS = _KeywordGroups({
+    f"bundle{index}": triggers for index, (triggers, _) in enumerate(_SOLUTION_FEATURE_BUNDLES)
+})
+
+@lru_cache(maxsize=512)
+def _solution_features(solution: str) -> Tuple[str, ...]:
+    """Base features plus every bundle whose keywords appear in the lowercased solution"""
+    matched = _SOLUTION_FEATURE_GROUPS.groups_in(solution)
+    return _BASE_FEATURES + tuple(
+        feature
+        for index, (_, features) in enumerate(_SOLUTION_FEATURE_BUNDLES)
+        if f"bundle{index}" in matched
+        for feature in features
+    )
+
 @dataclass
 class FounderProfile:
     type: FounderType
@@ -72,7 +191,7 @@ class VoiceConversationEngine:
             conversation_history=[{
                 "role": "user",
                 "content": initial_input,
-                "timestamp": datetime.now().isoformat()
+                "timestamp": utc_now_iso()
             }],
             founder_profile=founder_profile,
             current_state=ConversationState.DISCOVERY,
@@ -89,7 +208,7 @@ class VoiceConversationEngine:
         session.conversation_history.append({
             "role": "assistant",
             "content": ai_response,
-            "timestamp": datetime.now().isoformat(),
+            "timestamp": utc_now_iso(),
             "state": session.current_state.value
         })
         
@@ -99,23 +218,10 @@ class VoiceConversationEngine:
     async def _detect_founder_type(self, input_text: str) -> FounderProfile:
         """AI-powered founder type detection"""
         
-        # Technical indicators
-        technical_keywords = [
-            "api", "database", "react", "python", "javascript", "backend", 
-            "frontend", "microservices", "docker", "kubernetes", "aws", "gcp",
-            "stripe integration", "authentication", "jwt", "oauth"
-        ]
-        
-        # Business indicators  
-        business_keywords = [
-            "market", "customers", "revenue", "monetization", "business model",
-            "user acquisition", "marketing", "sales", "fundraising", "investors",
-            "problem solving", "customer pain", "market size"
-        ]
-        
-        input_lower = input_text.lower()
-        technical_score = sum(1 for keyword in technical_keywords if keyword in input_lower)
-        business_score = sum(1 for keyword in business_keywords if keyword in input_lower)
+        # Single pass over the input for both indicator groups
+        found = _FOUNDER_KEYWORD_GROUPS.keywords_in(input_text.lower())
+        technical_score = len(found & _FOUNDER_KEYWORD_GROUPS.groups[FounderType.TECHNICAL.value])
+        business_score = len(found & _FOUNDER_KEYWORD_GROUPS.groups[FounderType.BUSINESS.value])
         
         # Advanced AI classification
         classification_prompt = f"""
@@ -227,6 +333,19 @@ class VoiceConversationEngine:
             # Default intelligent response
             return await self._generate_contextual_response(session)
     
+    async def _complete_text(self, prompt: str, fallback: str, temperature: float = 0.7) -> str:
+        """Run a single-prompt completion, returning the fallback text on any failure"""
+        
+        try:
+            response = await self.openai_client.chat.completions.create(
+                model="gpt-4",
+                messages=[{"role": "user", "content": prompt}],
+                temperature=temperature
+            )
+            return response.choices[0].message.content.strip()
+        except:
+            return fallback
+    
     async def _generate_validation_question(self, input_text: str) -> str:
         """Generate intelligent validation questions based on input"""
         
@@ -245,15 +364,10 @@ class VoiceConversationEngine:
         Example: "I notice most task managers fail because they don't integrate with team workflows. Should we add Slack integration to make this more valuable?"
         """
         
-        try:
-            response = await self.openai_client.chat.completions.create(
-                model="gpt-4",
-                messages=[{"role": "user", "content": validation_prompt}],
-                temperature=0.7
-            )
-            return response.choices[0].message.content.strip()
-        except:
-            return "Have you thought about how this differentiates from existing solutions?"
+        return await self._complete_text(
+            validation_prompt,
+            fallback="Have you thought about how this differentiates from existing solutions?"
+        )
     
     async def _generate_validation_response(self, session: ConversationSession) -> str:
         """Generate business validation response"""
@@ -278,15 +392,10 @@ class VoiceConversationEngine:
         Be encouraging but realistic. Format as a conversational response.
         """
         
-        try:
-            response = await self.openai_client.chat.completions.create(
-                model="gpt-4",
-                messages=[{"role": "user", "content": validation_prompt}],
-                temperature=0.7
-            )
-            return response.choices[0].message.content.strip()
-        except:
-            return "I'd love to help validate your business idea! Could you tell me more about the problem you're solving and your target customers?"
+        return await self._complete_text(
+            validation_prompt,
+            fallback="I'd love to help validate your business idea! Could you tell me more about the problem you're solving and your target customers?"
+        )
     
     async def _generate_agreement_response(self, session: ConversationSession) -> str:
         """Generate founder-AI agreement response"""
@@ -320,15 +429,10 @@ class VoiceConversationEngine:
         Focus on being collaborative and solution-oriented.
         """
         
-        try:
-            response = await self.openai_client.chat.completions.create(
-                model="gpt-4",
-                messages=[{"role": "user", "content": contextual_prompt}],
-                temperature=0.7
-            )
-            return response.choices[0].message.content.strip()
-        except:
-            return "I'm here to help you build your vision! What would you like to focus on next?"
+        return await self._complete_text(
+            contextual_prompt,
+            fallback="I'm here to help you build your vision! What would you like to focus on next?"
+        )
     
     async def process_conversation_turn(self, session_id: str, user_response: str) -> Dict:
         """Process user response and advance conversation"""
@@ -342,7 +446,7 @@ class VoiceConversationEngine:
         session.conversation_history.append({
             "role": "user", 
             "content": user_response,
-            "timestamp": datetime.now().isoformat()
+            "timestamp": utc_now_iso()
         })
         
         # Process response and update state
@@ -354,7 +458,7 @@ class VoiceConversationEngine:
         session.conversation_history.append({
             "role": "assistant",
             "content": ai_response,
-            "timestamp": datetime.now().isoformat(),
+            "timestamp": utc_now_iso(),
             "state": session.current_state.value
         })
         
@@ -368,13 +472,16 @@ class VoiceConversationEngine:
     async def _process_user_input(self, session: ConversationSession, user_input: str) -> None:
         """Process user input and update conversation state"""
         
-        input_lower = user_input.lower()
+        # Only discovery and strategy transitions depend on what was said
+        triggers = set()
+        if session.current_state in (ConversationState.DISCOVERY, ConversationState.STRATEGY):
+            triggers = _TRANSITION_TRIGGER_GROUPS.groups_in(user_input.lower())
         
         # State transition logic
         if session.current_state == ConversationState.DISCOVERY:
-            if "start coding" in input_lower or "generate code" in input_lower:
+            if "coding" in triggers:
                 session.current_state = ConversationState.AGREEMENT
-            elif "validate" in input_lower or "business" in input_lower:
+            elif "validation" in triggers:
                 session.current_state = ConversationState.VALIDATION
                 session.validation_requested = True
                 
@@ -384,7 +491,7 @@ class VoiceConversationEngine:
             session.current_state = ConversationState.STRATEGY
             
         elif session.current_state == ConversationState.STRATEGY:
-            if "yes" in input_lower or "agree" in input_lower or "sounds good" in input_lower:
+            if "agreement" in triggers:
                 session.strategy_validated = True
                 session.current_state = ConversationState.AGREEMENT
                 
@@ -441,7 +548,7 @@ class VoiceConversationEngine:
             "agreement_id": str(uuid.uuid4()),
             "session_id": session_id,
             "founder_id": session.user_id,
-            "timestamp": datetime.now().isoformat(),
+            "timestamp": utc_now_iso(),
             "business_specification": {
                 "problem_statement": business_idea.get("problem", ""),
                 "solution_description": business_idea.get("solution", ""),
@@ -497,48 +604,8 @@ class VoiceConversationEngine:
     async def _generate_feature_list(self, business_idea: Dict) -> List[str]:
         """Generate comprehensive feature list based on business idea"""
         
-        base_features = [
-            "User authentication and authorization",
-            "Responsive web interface", 
-            "RESTful API backend",
-            "Database integration",
-            "Security implementation",
-            "Error handling and logging",
-            "API documentation"
-        ]
-        
-        # Add specific features based on business type
-        problem = business_idea.get("problem", "").lower()
-        solution = business_idea.get("solution", "").lower()
-        
-        if "marketplace" in solution or "booking" in solution:
-            base_features.extend([
-                "User profiles and ratings",
-                "Booking/scheduling system",
-                "Payment processing integration",
-                "Notification system",
-                "Search and filtering"
-            ])
-            
-        if "e-commerce" in solution or "shop" in solution:
-            base_features.extend([
-                "Product catalog management",
-                "Shopping cart functionality", 
-                "Order processing system",
-                "Inventory management",
-                "Payment gateway integration"
-            ])
-            
-        if "social" in solution or "community" in solution:
-            base_features.extend([
-                "Social authentication",
-                "User-generated content",
-                "Real-time messaging",
-                "Feed/timeline functionality",
-                "Content moderation"
-            ])
-            
-        return base_features
+        # Add specific features based on business type (only the solution is matched)
+        return list(_solution_features(business_idea.get("solution", "").lower()))
     
     async def _get_next_actions(self, session: ConversationSession) -> List[str]:
         """Get recommended next actions for current conversation state"""
@@ -6,16 +6,199 @@ Enhanced with error handling and audio format optimization
 
 import asyncio
 import openai
+import orjson
+import httpx
 import io
 import base64
-import tempfile
+import contextlib
+import hashlib
+import importlib.util
+import random
 import os
-from typing import Dict, Optional, Any
-from datetime import datetime
+import shutil
+import struct
+import time
+import wave
+from array import array
+from typing import Any, AsyncIterator, ClassVar, FrozenSet, List, NamedTuple, Optional, Tuple, Union
+from collections import OrderedDict
+from functools import lru_cache
 import logging
 from dataclasses import dataclass
 
-@dataclass
+# Read once at import so building a processor never goes back to the environment
+_OPENAI_API_KEY = os.getenv('OPENAI_API_KEY') or os.getenv('VOICE_API_KEY')
+
+# Transient failures worth retrying - transcription uploads are idempotent
+_RETRYABLE_API_ERRORS = (openai.RateLimitError, openai.APIConnectionError, openai.InternalServerError)
+
+# HTTP/2 multiplexing needs the optional h2 package; fall back to HTTP/1.1 keep-alive
+_HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
+
+@lru_cache(maxsize=4)
+def _get_openai_client(api_key: Optional[str]) -> openai.AsyncOpenAI:
+    """Get a shared AsyncOpenAI client (and its connection pool) per API key"""
+    http_client = openai.DefaultAsyncHttpxClient(
+        http2=_HTTP2_AVAILABLE,
+        limits=httpx.Limits(max_connections=100, max_keepalive_connections=20)
+    )
+    # VoiceProcessor owns retries (backoff, Retry-After, rate-limit feedback), so the SDK
+    # must not retry underneath it and multiply every failing call
+    return openai.AsyncOpenAI(api_key=api_key, http_client=http_client, max_retries=0)
+
+def _build_silence_wav(sample_rate: int = 16000, duration: float = 1.0) -> bytes:
+    """Build a mono 16-bit PCM WAV of silence (16kHz is Whisper's native rate)"""
+    num_samples = int(sample_rate * duration)
+    
+    # WAV file header (44 bytes)
+    wav_header = struct.pack('<4sI4s4sIHHIIHH4sI',
+        b'RIFF',           # ChunkID
+        36 + num_samples * 2,  # ChunkSize
+        b'WAVE',           # Format
+        b'fmt ',           # Subchunk1ID
+        16,                # Subchunk1Size (PCM)
+        1,                 # AudioFormat (PCM)
+        1,                 # NumChannels (mono)
+        sample_rate,       # SampleRate
+        sample_rate * 2,   # ByteRate
+        2,                 # BlockAlign
+        16,                # BitsPerSample
+        b'data',           # Subchunk2ID
+        num_samples * 2    # Subchunk2Size
+    )
+    
+    # Audio data (silence)
+    return wav_header + b'\x00' * (num_samples * 2)  # 16-bit samples
+
+# Deterministic probe clip used by initialize(), built once at import
+_INIT_TEST_WAV: bytes = _build_silence_wav()
+
+def _split_wav(audio_data: bytes, chunk_seconds: int) -> List[bytes]:
+    """Split PCM WAV audio into consecutive WAV clips of at most chunk_seconds each"""
+    try:
+        with wave.open(io.BytesIO(audio_data), 'rb') as wav_in:
+            params = wav_in.getparams()
+            frames = wav_in.readframes(params.nframes)
+    except (wave.Error, EOFError):
+        return [audio_data]
+    
+    chunk_bytes = params.framerate * chunk_seconds * params.sampwidth * params.nchannels
+    if len(frames) <= chunk_bytes:
+        return [audio_data]
+    
+    chunks = []
+    for offset in range(0, len(frames), chunk_bytes):
+        output = io.BytesIO()
+        with wave.open(output, 'wb') as wav_out:
+            wav_out.setparams(params)
+            wav_out.writeframes(frames[offset:offset + chunk_bytes])
+        chunks.append(output.getvalue())
+    return chunks
+
+def _concat_wav(audio_clips: List[bytes], max_seconds: float,
+                gap_seconds: float) -> Optional[Tuple[bytes, List[Tuple[float, float]]]]:
+    """Join short PCM WAV clips of one format with silence between them.
+
+    Returns the combined WAV and each clip's (start, end) window in seconds, or None when
+    any clip is not WAV, is longer than max_seconds, or differs in format from the first.
+    """
+    params = None
+    clip_frames = []
+    for audio_data in audio_clips:
+        try:
+            with wave.open(io.BytesIO(audio_data), 'rb') as wav_in:
+                clip_params = wav_in.getparams()
+                frames = wav_in.readframes(clip_params.nframes)
+        except (wave.Error, EOFError):
+            return None
+        if clip_params.nframes > clip_params.framerate * max_seconds:
+            return None
+        if params is None:
+            params = clip_params
+        elif clip_params[:3] != params[:3]:
+            return None
+        clip_frames.append(frames)
+    
+    frame_bytes = params.sampwidth * params.nchannels
+    gap = b'\x00' * (int(params.framerate * gap_seconds) * frame_bytes)
+    windows = []
+    position = 0.0
+    for frames in clip_frames:
+        duration = len(frames) / frame_bytes / params.framerate
+        windows.append((position, position + duration))
+        position += duration + gap_seconds
+    
+    output = io.BytesIO()
+    with wave.open(output, 'wb') as wav_out:
+        wav_out.setparams(params)
+        wav_out.writeframes(gap.join(clip_frames))
+    return output.getvalue(), windows
+
+@lru_cache(maxsize=2)
+def _get_local_whisper_model(model_size: str):
+    """Load a faster-whisper model once per size (optional dependency, imported on first use)"""
+    from faster_whisper import WhisperModel
+    return WhisperModel(model_size, device="auto", compute_type="int8")
+
+class _Transcription(NamedTuple):
+    """Plain-text transcription, as returned by either backend"""
+    text: str
+
+# Bytes needed to recognise every supported container from its header
+AUDIO_SNIFF_BYTES = 12
+
+def _has_audio_signature(header: bytes) -> bool:
+    """Cheap magic-byte check for the containers Whisper accepts (WAV, MP3, MP4/M4A, WebM)"""
+    return (
+        (header[:4] == b'RIFF' and header[8:12] == b'WAVE')
+        or header[:3] == b'ID3'
+        or (len(header) > 1 and header[0] == 0xFF and header[1] & 0xE0 == 0xE0)
+        or header[4:8] == b'ftyp'
+        or header[:4] == b'\x1a\x45\xdf\xa3'
+    )
+
+def _audio_digest(audio_data: bytes) -> bytes:
+    """Content digest used as the transcription cache key"""
+    return hashlib.blake2b(audio_data, digest_size=16).digest()
+
+def _trim_wav_silence(audio_data: bytes, frame_ms: int = 30, threshold: int = 500) -> bytes:
+    """Drop leading/trailing low-energy frames from 16-bit PCM WAV audio"""
+    try:
+        with wave.open(io.BytesIO(audio_data), 'rb') as wav_in:
+            params = wav_in.getparams()
+            if params.sampwidth != 2:
+                return audio_data
+            frames = wav_in.readframes(params.nframes)
+    except (wave.Error, EOFError):
+        return audio_data
+    
+    samples = array('h', frames)
+    if samples.itemsize != 2:
+        return audio_data
+    
+    # Only the edges are scanned; the voiced middle is never touched
+    step = max(1, params.framerate * frame_ms // 1000) * params.nchannels
+    offsets = range(0, len(samples), step)
+    
+    def is_voiced(offset: int) -> bool:
+        frame = samples[offset:offset + step]
+        return max(frame) >= threshold or -min(frame) >= threshold
+    
+    first = next((offset for offset in offsets if is_voiced(offset)), None)
+    if first is None:
+        return audio_data  # all silence - let Whisper decide
+    last = next(offset for offset in reversed(offsets) if is_voiced(offset))
+    end = min(len(samples), last + step)
+    if first == 0 and end == len(samples):
+        return audio_data
+    
+    output = io.BytesIO()
+    with wave.open(output, 'wb') as wav_out:
+        wav_out.setparams(params)
+        wav_out.writeframes(frames[first * 2:end * 2])
+    return output.getvalue()
+
+@dataclass(slots=True, frozen=True)
 class VoiceProcessingResult:
     success: bool
     transcription: Optional[str]
@@ -23,95 +206,379 @@ class VoiceProcessingResult:
     processing_time: float
     error_message: Optional[str]
 
+class ValidationResult(NamedTuple):
+    valid: bool
+    errors: Tuple[str, ...]
+    warnings: Tuple[str, ...]
+
+# Shared result for the common all-clear case - no per-call allocation
+_OK_VALIDATION = ValidationResult(True, (), ())
+
+class _TokenBucket:
+    """Async token bucket that smooths bursts of Whisper requests
+    
+    The refill rate adapts AIMD-style: halved on each 429, then grown back by a
+    small step per success until it reaches the configured requests per minute.
+    """
+    
+    def __init__(self, requests_per_minute: int):
+        self.capacity = max(1, requests_per_minute)
+        self.tokens = float(self.capacity)
+        self.max_rate = self.capacity / 60.0
+        self.refill_rate = self.max_rate
+        self.updated_at = time.monotonic()
+        self._lock = asyncio.Lock()
+    
+    def on_rate_limited(self):
+        """Multiplicative decrease: halve the rate and drop any burst allowance"""
+        self.refill_rate = max(self.max_rate / 16, self.refill_rate / 2)
+        self.tokens = min(self.tokens, 0.0)
+    
+    def on_success(self):
+        """Additive increase back toward the configured rate"""
+        if self.refill_rate < self.max_rate:
+            self.refill_rate = min(self.max_rate, self.refill_rate + self.max_rate / 20)
+    
+    async def acquire(self):
+        """Wait until a request token is available, then consume it"""
+        while True:
+            # Only the refill/consume step is locked; waiting for a token happens outside it
+            async with self._lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.refill_rate)
+                self.updated_at = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = (1 - self.tokens) / self.refill_rate
+            await asyncio.sleep(wait)
+
 class VoiceProcessor:
     """Production-ready voice processing with OpenAI Whisper"""
     
-    def __init__(self, openai_api_key: str):
-        self.client = openai.AsyncOpenAI(api_key=openai_api_key)
+    SUPPORTED_FORMATS: ClassVar[FrozenSet[str]] = frozenset({
+        '.mp3', '.mp4', '.mpeg', '.mpga', '.m4a', '.wav', '.webm'
+    })
+    
+    # Clips smaller than this are mostly noise/retries and not worth caching
+    CACHE_MIN_BYTES: ClassVar[int] = 4 * 1024
+    
+    # With chunk_long_audio, WAV clips longer than this are transcribed as segments of this length
+    CHUNK_SECONDS: ClassVar[int] = 30
+    
+    # Batched WAV clips up to this long share one Whisper request, separated by silence
+    COALESCE_MAX_SECONDS: ClassVar[float] = 10.0
+    COALESCE_GAP_SECONDS: ClassVar[float] = 1.0
+    COALESCE_MAX_CLIPS: ClassVar[int] = 16
+    
+    # Uploads at or below this size go to Whisper as-is and are hashed inline; larger ones
+    # are hashed on a worker thread and downmixed first
+    TRANSCODE_MIN_BYTES: ClassVar[int] = 1024 * 1024
+    # A transcode that takes longer than this is abandoned and the original uploaded
+    TRANSCODE_TIMEOUT_SECONDS: ClassVar[float] = 60.0
+    
+    def __init__(self, openai_api_key: Optional[str] = None, max_concurrency: int = 8, requests_per_minute: int = 50,
+                 cache_max_entries: int = 1024, redis_client: Optional[Any] = None, cache_ttl: int = 7 * 24 * 3600,
+                 batch_concurrency: int = 3, backend: str = "openai_api", local_model: str = "base",
+                 whisper_model: str = "whisper-1", language: Optional[str] = None, transcode: bool = True,
+                 coalesce_short_clips: bool = False):
+        self.client = _get_openai_client(openai_api_key or _OPENAI_API_KEY)
         self.logger = logging.getLogger(__name__)
-        self.supported_formats = ['.mp3', '.mp4', '.mpeg', '.mpga', '.m4a', '.wav', '.webm']
         self.max_file_size = 25 * 1024 * 1024
+        self.max_retries = 3
+        # Caps in-flight OpenAI audio calls (Whisper and TTS) and their upload buffers
+        self._api_semaphore = asyncio.Semaphore(max_concurrency)
+        self._rate_limiter = _TokenBucket(requests_per_minute)
+        self.batch_concurrency = batch_concurrency
+        # LRU of successful transcriptions keyed by (format, content digest)
+        self._cache: "OrderedDict[Tuple[str, bytes], VoiceProcessingResult]" = OrderedDict()
+        self._cache_max_entries = cache_max_entries
+        # Clips currently being transcribed, so concurrent duplicates wait for one API call
+        self._inflight: "dict[Tuple[str, bytes], asyncio.Event]" = {}
+        # Optional shared second tier (redis.asyncio client) so hits survive restarts/replicas
+        self._redis = redis_client
+        self._cache_ttl = cache_ttl
+        # "openai_api" (remote Whisper) or "faster_whisper" (local CTranslate2 inference)
+        self.backend = backend
+        self.local_model = local_model
+        # Remote transcription model, e.g. "gpt-4o-mini-transcribe" for lower latency on short prompts
+        self.whisper_model = whisper_model
+        # ISO-639-1 hint (e.g. "en"); None lets Whisper detect the language
+        self.language = language
+        # Whisper only needs 16 kHz mono, so large uploads are re-encoded with ffmpeg when available
+        self.transcode = transcode and shutil.which("ffmpeg") is not None
+        self._transcode_semaphore = asyncio.Semaphore(os.cpu_count() or 1)
+        # Send short batched clips as one concatenated request (needs whisper-1 segment timestamps)
+        self.coalesce_short_clips = coalesce_short_clips
         self._initialized = False 
+    
+    async def _create_transcription(self, audio_file: Tuple[str, bytes], response_format: str = "text"):
+        """Call Whisper under the concurrency cap and rate limiter, backing off on 429/5xx/connection errors"""
+        
+        for attempt in range(self.max_retries + 1):
+            try:
+                # Wait for a rate-limit token before taking a concurrency slot, so throttled
+                # requests don't hold slots while they wait
+                await self._rate_limiter.acquire()
+                async with self._api_semaphore:
+                    response = await self.client.audio.transcriptions.create(
+                        model=self.whisper_model,
+                        file=audio_file,
+                        response_format=response_format,
+                        language=self.language or openai.NOT_GIVEN
+                    )
+                    self._rate_limiter.on_success()
+                    return response
+            except _RETRYABLE_API_ERRORS as e:
+                if isinstance(e, openai.RateLimitError):
+                    self._rate_limiter.on_rate_limited()
+                if attempt == self.max_retries:
+                    raise
+                delay = min(0.5 * (2 ** attempt), 8.0) + random.uniform(0, 0.5)
+                # Honour the server's Retry-After on 429/503 rather than guessing
+                response = getattr(e, 'response', None)
+                retry_after = response.headers.get('retry-after') if response is not None else None
+                if retry_after:
+                    try:
+                        delay = max(delay, min(float(retry_after), 30.0))
+                    except ValueError:
+                        pass
+                self.logger.warning("Whisper request failed (%s), retrying in %.2fs: %s", type(e).__name__, delay, e)
+                await asyncio.sleep(delay)
+    
+    def _transcribe_local(self, audio_data: bytes) -> _Transcription:
+        """Run faster-whisper on the clip (blocking - call via asyncio.to_thread)"""
+        segments, _ = _get_local_whisper_model(self.local_model).transcribe(io.BytesIO(audio_data), beam_size=1)
+        return _Transcription(text="".join(segment.text for segment in segments).strip())
+    
+    async def _transcribe_bytes(self, audio_data: bytes, audio_format: str):
+        """Single upload path shared by transcription and the initialization probe"""
+        
+        if self.backend == "faster_whisper":
+            async with self._api_semaphore:
+                return await asyncio.to_thread(self._transcribe_local, audio_data)
+        
+        audio_data, audio_format = await self._transcode_for_upload(audio_data, audio_format)
+        
+        # Upload straight from memory - the SDK takes a (filename, bytes) pair, so there is
+        # no file-like wrapper to build or rewind between retries
+        # Only the text is used, so skip the JSON envelope
+        text = await self._create_transcription((f"audio{audio_format}", audio_data))
+        return _Transcription(text=text.strip())
+    
+    async def _transcode_for_upload(self, audio_data: bytes, audio_format: str) -> Tuple[bytes, str]:
+        """Re-encode large clips to 16 kHz mono Ogg Opus, keeping the original on any failure"""
+        
+        if not self.transcode or len(audio_data) <= self.TRANSCODE_MIN_BYTES:
+            return audio_data, audio_format
+        
+        # Piped through stdin/stdout, single-threaded so a few encodes never starve the event loop
+        async with self._transcode_semaphore:
+            process = None
+            try:
+                process = await asyncio.create_subprocess_exec(
+                    "ffmpeg", "-nostdin", "-loglevel", "error", "-threads", "1",
+                    "-i", "pipe:0", "-ac", "1", "-ar", "16000", "-c:a", "libopus", "-b:a", "16k",
+                    "-f", "ogg", "pipe:1",
+                    stdin=asyncio.subprocess.PIPE,
+                    stdout=asyncio.subprocess.PIPE,
+                    stderr=asyncio.subprocess.PIPE
+                )
+                encoded, stderr = await asyncio.wait_for(
+                    process.communicate(audio_data), self.TRANSCODE_TIMEOUT_SECONDS
+                )
+            except Exception as e:
+                self.logger.warning("Audio transcode failed, uploading original: %r", e)
+                return audio_data, audio_format
+            finally:
+                # Timed out, failed or cancelled mid-encode: don't leave ffmpeg running or unreaped
+                if process is not None and process.returncode is None:
+                    with contextlib.suppress(ProcessLookupError):
+                        process.kill()
+                    await process.wait()
+        
+        if process.returncode != 0 or not encoded or len(encoded) >= len(audio_data):
+            # e.g. MP4 with a trailing moov atom cannot be demuxed from a pipe
+            self.logger.debug("Audio transcode skipped (%s): %r", process.returncode, stderr[-200:])
+            return audio_data, audio_format
+        
+        return encoded, '.ogg'
+    
+    def _redis_key(self, cache_key: Tuple[str, bytes]) -> str:
+        # Shared across processes, so scope entries to the model and language that produced them
+        model = self.local_model if self.backend == "faster_whisper" else self.whisper_model
+        return f"voice:transcription:{model}:{self.language or 'auto'}:{cache_key[0]}:{cache_key[1].hex()}"
+    
+    def _cache_remember(self, cache_key: Tuple[str, bytes], result: VoiceProcessingResult):
+        """Insert into the in-process LRU, evicting the oldest entry when full"""
+        self._cache[cache_key] = result
+        if len(self._cache) > self._cache_max_entries:
+            self._cache.popitem(last=False)
+    
+    async def _cache_get(self, cache_key: Tuple[str, bytes]) -> Optional[VoiceProcessingResult]:
+        """Look up a transcription in the LRU, then in Redis when configured"""
+        
+        cached = self._cache.get(cache_key)
+        if cached is not None:
+            self._cache.move_to_end(cache_key)
+            return cached
+        
+        if self._redis is None:
+            return None
+        
+        try:
+            payload = await self._redis.get(self._redis_key(cache_key))
+        except Exception as e:
+            self.logger.warning("Transcription cache lookup failed: %s", e)
+            return None
+        if payload is None:
+            return None
+        
+        stored = orjson.loads(payload)
+        cached = VoiceProcessingResult(
+            success=True,
+            transcription=stored["transcription"],
+            confidence=stored["confidence"],
+            processing_time=stored["processing_time"],
+            error_message=None
+        )
+        self._cache_remember(cache_key, cached)
+        return cached
+    
+    async def _cache_put(self, cache_key: Tuple[str, bytes], result: VoiceProcessingResult):
+        """Store a successful transcription in the LRU and, when configured, Redis"""
         
-    async def transcribe_audio(self, audio_data: bytes, audio_format: str = "webm") -> VoiceProcessingResult:
-        """Transcribe audio using OpenAI Whisper"""
+        self._cache_remember(cache_key, result)
         
-        start_time = datetime.now()
+        if self._redis is None:
+            return
+        
+        payload = orjson.dumps({
+            "transcription": result.transcription,
+            "confidence": result.confidence,
+            "processing_time": result.processing_time
+        })
+        try:
+            await self._redis.set(self._redis_key(cache_key), payload, ex=self._cache_ttl)
+        except Exception as e:
+            self.logger.warning("Transcription cache store failed: %s", e)
+    
+    def _validate_fast(self, audio_data: bytes, audio_format: str) -> Optional[str]:
+        """Return the first validation error for a normalized format, or None if valid"""
+        
+        if audio_format not in self.SUPPORTED_FORMATS:
+            return f"Unsupported audio format: {audio_format}"
+        
+        size = len(audio_data)
+        if size == 0:
+            return "Audio file is empty"
+        if size < 1000:  # Less than 1KB
+            return "Audio file too small - minimum 1KB required"
+        if size > self.max_file_size:
+            return f"Audio file too large: {size} bytes (max: {self.max_file_size})"
+        if not _has_audio_signature(audio_data[:AUDIO_SNIFF_BYTES]):
+            return "Audio file content is not a recognised audio container"
+        return None
+    
+    @staticmethod
+    def _failure(error_message: str, processing_time: float = 0) -> VoiceProcessingResult:
+        """Build a failed processing result"""
+        return VoiceProcessingResult(
+            success=False,
+            transcription=None,
+            confidence=None,
+            processing_time=processing_time,
+            error_message=error_message
+        )
+        
+    async def transcribe_audio(self, audio_data: bytes, audio_format: str = "webm", trim_silence: bool = True,
+                               chunk_long_audio: bool = False) -> VoiceProcessingResult:
+        """Transcribe audio using OpenAI Whisper
+
+        chunk_long_audio opts in to splitting long WAV clips into CHUNK_SECONDS segments
+        transcribed in parallel; words that straddle a cut point can be split or dropped.
+        """
+        
+        start_time = time.perf_counter()
         
         if not self._initialized:
-            return VoiceProcessingResult(
-                success=False,
-                transcription=None,
-                confidence=None,
-                processing_time=0,
-                error_message="Voice processor not initialized"
-            )
+            return self._failure("Voice processor not initialized")
         
         try:
-            # Validate audio format
+            # Validate audio format and size
             if not audio_format.startswith('.'):
                 audio_format = f'.{audio_format}'
             
-            if audio_format not in self.supported_formats:
-                return VoiceProcessingResult(
-                    success=False,
-                    transcription=None,
-                    confidence=None,
-                    processing_time=0,
-                    error_message=f"Unsupported audio format: {audio_format}"
-                )
+            error_message = self._validate_fast(audio_data, audio_format)
+            if error_message is not None:
+                return self._failure(error_message)
             
-            # ✅ FIX: Add minimum file size validation
-            if len(audio_data) < 1000:  # Less than 1KB
-                return VoiceProcessingResult(
-                    success=False,
-                    transcription=None,
-                    confidence=None,
-                    processing_time=0,
-                    error_message="Audio file too small - minimum 1KB required"
-                )
+            # Identical clips (client retries, duplicate frames) skip the API entirely.
+            # BLAKE2b over the buffer we already hold is copy-free; only multi-MB clips are
+            # worth a worker-thread hop (hashlib drops the GIL while it runs)
+            if len(audio_data) > self.TRANSCODE_MIN_BYTES:
+                digest = await asyncio.to_thread(_audio_digest, audio_data)
+            else:
+                digest = _audio_digest(audio_data)
+            cache_key = (audio_format, digest)
+            cached = await self._cache_get(cache_key)
+            if cached is not None:
+                return cached
             
-            # Validate maximum file size
-            if len(audio_data) > self.max_file_size:
-                return VoiceProcessingResult(
-                    success=False,
-                    transcription=None,
-                    confidence=None,
-                    processing_time=0,
-                    error_message=f"Audio file too large: {len(audio_data)} bytes (max: {self.max_file_size})"
-                )
-            
-            # ✅ FIX: Add empty file check
-            if len(audio_data) == 0:
-                return VoiceProcessingResult(
-                    success=False,
-                    transcription=None,
-                    confidence=None,
-                    processing_time=0,
-                    error_message="Audio file is empty"
-                )
-            
-            # Create temporary file for OpenAI API
-            with tempfile.NamedTemporaryFile(suffix=audio_format, delete=False) as temp_file:
-                temp_file.write(audio_data)
-                temp_file_path = temp_file.name
+            # A duplicate of a clip already in flight (double submit, client retry) waits for
+            # that call's cache entry; if it didn't produce one, transcribe it here instead
+            cacheable = len(audio_data) >= self.CACHE_MIN_BYTES
+            if cacheable:
+                pending = self._inflight.get(cache_key)
+                if pending is not None:
+                    await pending.wait()
+                    cached = await self._cache_get(cache_key)
+                    if cached is not None:
+                        return cached
+            leader = cacheable and cache_key not in self._inflight
+            if leader:
+                self._inflight[cache_key] = asyncio.Event()
             
             try:
-                # Call OpenAI Whisper API
-                with open(temp_file_path, 'rb') as audio_file:
-                    response = await self.client.audio.transcriptions.create(
-                        model="whisper-1",
-                        file=audio_file,
-                        response_format="json"
-                    )
+                # Strip head/tail silence from PCM clips so fewer seconds are uploaded and billed
+                upload_data = audio_data
+                if trim_silence and audio_format == '.wav':
+                    upload_data = await asyncio.to_thread(_trim_wav_silence, audio_data)
+                
+                # Don't pin the original clip (up to 25MB) for the whole API round-trip
+                del audio_data
                 
-                # Extract transcription and confidence
-                transcription = response.text if hasattr(response, 'text') else ""
-                confidence = getattr(response, 'confidence', None)
+                # Opted-in long PCM clips are split into Whisper's native 30s windows
+                segments = [upload_data]
+                if chunk_long_audio and audio_format == '.wav':
+                    segments = await asyncio.to_thread(_split_wav, upload_data, self.CHUNK_SECONDS)
+                del upload_data
+                
+                if len(segments) == 1:
+                    # Call OpenAI Whisper API
+                    response = await self._transcribe_bytes(segments[0], audio_format)
+                    
+                    # Whisper doesn't report a confidence score
+                    transcription = response.text
+                    confidence = None
+                else:
+                    # At most batch_concurrency segments of one clip in flight, so a long upload
+                    # can't take every API slot and rate-limit token from other requests
+                    segment_semaphore = asyncio.Semaphore(self.batch_concurrency)
+                    
+                    async def transcribe_segment(segment: bytes) -> _Transcription:
+                        async with segment_semaphore:
+                            return await self._transcribe_bytes(segment, audio_format)
+                    
+                    responses = await asyncio.gather(*(transcribe_segment(segment) for segment in segments))
+                    transcription = " ".join(
+                        response.text for response in responses if response.text
+                    )
+                    confidence = None
                 
-                processing_time = (datetime.now() - start_time).total_seconds()
+                processing_time = time.perf_counter() - start_time
                 
-                return VoiceProcessingResult(
+                result = VoiceProcessingResult(
                     success=True,
                     transcription=transcription,
                     confidence=confidence,
@@ -119,84 +586,126 @@ class VoiceProcessor:
                     error_message=None
                 )
                 
+                if transcription and cacheable:
+                    await self._cache_put(cache_key, result)
+                
+                return result
+                
             except openai.APIError as e:
-                processing_time = (datetime.now() - start_time).total_seconds()
+                processing_time = time.perf_counter() - start_time
                 error_msg = f"OpenAI API error: {str(e)}"
                 self.logger.error(error_msg)
                 
-                return VoiceProcessingResult(
-                    success=False,
-                    transcription=None,
-                    confidence=None,
-                    processing_time=processing_time,
-                    error_message=error_msg
-                )
-                
+                return self._failure(error_msg, processing_time)
+            
             finally:
-                # Clean up temporary file
-                if os.path.exists(temp_file_path):
-                    os.unlink(temp_file_path)
+                if leader:
+                    self._inflight.pop(cache_key).set()
             
         except Exception as e:
-            processing_time = (datetime.now() - start_time).total_seconds()
+            processing_time = time.perf_counter() - start_time
             error_msg = f"Voice processing error: {str(e)}"
             self.logger.error(error_msg)
             
-            return VoiceProcessingResult(
-                success=False,
-                transcription=None,
+            return self._failure(error_msg, processing_time)
+
+    async def _transcribe_coalesced(self, clips: List[bytes]) -> Optional[List[VoiceProcessingResult]]:
+        """Transcribe short WAV clips with one request, splitting the text by segment timestamps.
+
+        Clips already in the cache are not uploaded again. Returns None (use the per-clip path)
+        when fewer than two clips are left or they can't be joined.
+        """
+        
+        start_time = time.perf_counter()
+        results: List[Optional[VoiceProcessingResult]] = [
+            await self._cache_get(('.wav', _audio_digest(clip))) for clip in clips
+        ]
+        pending = [index for index, result in enumerate(results) if result is None]
+        if len(pending) < 2:
+            return None
+        
+        joined = await asyncio.to_thread(
+            _concat_wav, [clips[index] for index in pending], self.COALESCE_MAX_SECONDS, self.COALESCE_GAP_SECONDS
+        )
+        if joined is None:
+            return None
+        audio_data, windows = joined
+        
+        response = await self._create_transcription(("audio.wav", audio_data), response_format="verbose_json")
+        
+        # Each segment belongs to the clip whose window (plus half the spacer) holds its midpoint
+        half_gap = self.COALESCE_GAP_SECONDS / 2
+        texts = [[] for _ in windows]
+        for segment in response.segments or ():
+            midpoint = (segment.start + segment.end) / 2
+            for index, (_, clip_end) in enumerate(windows):
+                if midpoint < clip_end + half_gap:
+                    texts[index].append(segment.text.strip())
+                    break
+            else:
+                texts[-1].append(segment.text.strip())
+        
+        # Segment-to-clip assignment is a best guess (Whisper can merge speech across the gap),
+        # so these results are never cached under the keys of real single-clip transcriptions
+        processing_time = time.perf_counter() - start_time
+        for index, parts in zip(pending, texts):
+            results[index] = VoiceProcessingResult(
+                success=True,
+                transcription=" ".join(part for part in parts if part),
                 confidence=None,
                 processing_time=processing_time,
-                error_message=error_msg
+                error_message=None
             )
-            
-    async def initialize(self):
-        """Initialize voice processor with proper test audio"""
+        return results
+    
+    async def transcribe_audio_batch(self, clips: List[bytes], audio_format: str = "webm", trim_silence: bool = True,
+                                     concurrency: Optional[int] = None) -> List[VoiceProcessingResult]:
+        """Transcribe several clips concurrently, returning results in input order"""
+        
+        # Short WAV clips are dominated by per-request overhead, so send them as one upload;
+        # anything that doesn't qualify (or a failed attempt) takes the per-clip path below
+        if (self.coalesce_short_clips and self._initialized and self.backend == "openai_api"
+                and self.whisper_model.startswith("whisper") and audio_format.lstrip('.') == 'wav'
+                and 1 < len(clips) <= self.COALESCE_MAX_CLIPS
+                and all(self._validate_fast(clip, '.wav') is None for clip in clips)):
+            try:
+                results = await self._transcribe_coalesced(clips)
+                if results is not None:
+                    return results
+            except Exception as e:
+                self.logger.warning("Coalesced transcription failed, transcribing clips separately: %s", e)
+        
+        # Optional per-batch cap so one large batch can't take every slot of the shared
+        # API semaphore; each clip still passes through that semaphore and the rate limiter
+        batch_semaphore = asyncio.Semaphore(concurrency or self.batch_concurrency)
+        
+        async def transcribe_one(clip: bytes) -> VoiceProcessingResult:
+            async with batch_semaphore:
+                return await self.transcribe_audio(clip, audio_format, trim_silence)
+        
+        return list(await asyncio.gather(*(transcribe_one(clip) for clip in clips)))
+
+    async def initialize(self, strict_validation: bool = False):
+        """Initialize voice processor, verifying the API key (strict mode runs a real Whisper probe)"""
         try:
+            if self.backend == "faster_whisper":
+                # Load the model now rather than on the first request
+                await asyncio.to_thread(_get_local_whisper_model, self.local_model)
+                self._initialized = True
+                self.logger.info("Voice processor initialized with local faster-whisper model '%s'", self.local_model)
+                return True
+            
             if not self.client.api_key:
                 self.logger.warning("OpenAI API key not provided for voice processing")
                 return False
             
-            # ✅ FIX: Create valid test audio (1 second of silence in WAV format)
-            sample_rate = 16000  # 16kHz for Whisper
-            duration = 1.0  # 1 second
-            num_samples = int(sample_rate * duration)
-            
-            # Create proper WAV file with header
-            import struct
-            
-            # WAV file header (44 bytes)
-            wav_header = struct.pack('<4sI4s4sIHHIIHH4sI',
-                b'RIFF',           # ChunkID
-                36 + num_samples * 2,  # ChunkSize
-                b'WAVE',           # Format
-                b'fmt ',           # Subchunk1ID
-                16,                # Subchunk1Size (PCM)
-                1,                 # AudioFormat (PCM)
-                1,                 # NumChannels (mono)
-                sample_rate,       # SampleRate
-                sample_rate * 2,   # ByteRate
-                2,                 # BlockAlign
-                16,                # BitsPerSample
-                b'data',           # Subchunk2ID
-                num_samples * 2    # Subchunk2Size
-            )
-            
-            # Audio data (silence)
-            audio_data = b'\x00' * (num_samples * 2)  # 16-bit samples
-            test_audio = wav_header + audio_data
-            
-            with tempfile.NamedTemporaryFile(suffix='.wav', delete=False) as temp_file:
-                temp_file.write(test_audio)
-                temp_file_path = temp_file.name
-            
             try:
-                with open(temp_file_path, 'rb') as audio_file:
-                    response = await self.client.audio.transcriptions.create(
-                        model="whisper-1",
-                        file=audio_file,
-                        response_format="json"
-                    )
+                if strict_validation:
+                    # ✅ FIX: Use valid test audio (1 second of silence in WAV format)
+                    await self._transcribe_bytes(_INIT_TEST_WAV, '.wav')
+                else:
+                    # Cheap authenticated GET - no upload and no billed Whisper call
+                    await self.client.models.list()
                 
                 # ✅ FIX: Don't ignore any API errors
                 self._initialized = True
@@ -204,81 +713,93 @@ class VoiceProcessor:
                 return True
                 
             except openai.APIError as e:
-                self.logger.error(f"Voice API test failed: {e}")
+                self.logger.error("Voice API test failed: %s", e)
                 return False
             except Exception as e:
-                self.logger.error(f"Voice processor test failed: {e}")
+                self.logger.error("Voice processor test failed: %s", e)
                 return False
-            finally:
-                if os.path.exists(temp_file_path):
-                    os.unlink(temp_file_path)
                     
         except Exception as e:
-            self.logger.error(f"Voice processor initialization failed: {e}")
+            self.logger.error("Voice processor initialization failed: %s", e)
             return False
     
-    async def transcribe_base64_audio(self, base64_audio: str, audio_format: str = "webm") -> VoiceProcessingResult:
-        """Transcribe base64-encoded audio"""
+    async def transcribe_base64_audio(self, base64_audio: Union[str, bytes], audio_format: str = "webm") -> VoiceProcessingResult:
+        """Transcribe base64-encoded audio (raw bytes avoid an extra str round-trip)"""
         
         try:
-            # Decode base64 audio
+            # Decode base64 audio, dropping the encoded copy as soon as it's consumed
+            if isinstance(base64_audio, str):
+                base64_audio = base64_audio.encode('ascii')
             audio_data = base64.b64decode(base64_audio)
+            del base64_audio
             
             # Process with standard transcription method
             return await self.transcribe_audio(audio_data, audio_format)
             
         except Exception as e:
-            return VoiceProcessingResult(
-                success=False,
-                transcription=None,
-                confidence=None,
-                processing_time=0,
-                error_message=f"Base64 decoding error: {str(e)}"
-            )
+            return self._failure(f"Base64 decoding error: {str(e)}")
+    
+    async def generate_speech_stream(self, text: str, voice: str = "alloy", chunk_size: int = 8192) -> AsyncIterator[bytes]:
+        """Stream MP3 speech from OpenAI TTS as it arrives, so playback can start on the first chunk.
+
+        Consume it inside contextlib.aclosing() so an abandoned stream closes its HTTP response.
+        """
+        
+        async with contextlib.AsyncExitStack() as stack:
+            # The API slot only covers opening the stream; it is released once headers arrive,
+            # so a slow or stalled consumer can't hold it away from transcription
+            async with self._api_semaphore:
+                response = await stack.enter_async_context(
+                    self.client.audio.speech.with_streaming_response.create(
+                        model="tts-1",
+                        voice=voice,
+                        input=text,
+                        response_format="mp3"
+                    )
+                )
+            async for chunk in response.iter_bytes(chunk_size):
+                yield chunk
     
     async def generate_speech(self, text: str, voice: str = "alloy") -> Optional[bytes]:
         """Generate speech from text using OpenAI TTS"""
         
         try:
-            response = await self.client.audio.speech.create(
-                model="tts-1",
-                voice=voice,
-                input=text,
-                response_format="mp3"
-            )
-            
-            return response.content
+            async with contextlib.aclosing(self.generate_speech_stream(text, voice)) as stream:
+                return b"".join([chunk async for chunk in stream])
             
         except Exception as e:
-            self.logger.error(f"Speech generation error: {str(e)}")
+            self.logger.error("Speech generation error: %s", e)
             return None
     
-    def validate_audio_input(self, audio_data: bytes, audio_format: str) -> Dict[str, Any]:
+    async def close(self):
+        """Close the pooled HTTP connections behind the OpenAI client"""
+        await self.client.close()
+        _get_openai_client.cache_clear()
+    
+    @staticmethod
+    def looks_like_audio(header: bytes) -> bool:
+        """Check the first AUDIO_SNIFF_BYTES of an upload before reading the rest of it"""
+        return _has_audio_signature(header)
+    
+    def validate_audio_input(self, audio_data: bytes, audio_format: str) -> ValidationResult:
         """Validate audio input parameters"""
         
-        validation_result = {
-            "valid": True,
-            "errors": [],
-            "warnings": []
-        }
-        
         # Check format
         if not audio_format.startswith('.'):
             audio_format = f'.{audio_format}'
         
-        if audio_format not in self.supported_formats:
-            validation_result["valid"] = False
-            validation_result["errors"].append(f"Unsupported format: {audio_format}")
+        if audio_format not in self.SUPPORTED_FORMATS:
+            return ValidationResult(False, (f"Unsupported format: {audio_format}",), ())
         
         # Check size
-        if len(audio_data) > self.max_file_size:
-            validation_result["valid"] = False
-            validation_result["errors"].append(f"File too large: {len(audio_data)} bytes")
+        size = len(audio_data)
+        if size > self.max_file_size:
+            return ValidationResult(False, (f"File too large: {size} bytes",), ())
         
-        if len(audio_data) < 1000:  # Less than 1KB
-            validation_result["warnings"].append("Audio file seems very small")
+        if size < 1000:  # Less than 1KB
+            return ValidationResult(True, (), ("Audio file seems very small",))
         
-        return validation_result
+        return _OK_VALIDATION
 
 # Global instance removed - all voice processing goes through ServiceManager
 # Use service_manager.voice_processor instead of importing this module's instance
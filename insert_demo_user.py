@@ -2,14 +2,28 @@ import asyncpg
 import os
 import asyncio
 
-async def main():
+# (id, email, hashed_password, full_name, is_active, is_verified)
+DEMO_USERS = [
+    ('00000000-0000-0000-0000-000000000001', 'demo@example.com', '', 'Demo User', True, True),
+]
+
+async def main(users=DEMO_USERS):
+    # One connection and one pipelined batch, however many seed rows there are
     conn = await asyncpg.connect(os.getenv('DATABASE_URL'))
-    await conn.execute(
-        "INSERT INTO users (id, email, hashed_password, full_name, is_active, is_verified) "
-        "VALUES ('00000000-0000-0000-0000-000000000001', 'demo@example.com', '', 'Demo User', true, true) "
-        "ON CONFLICT (id) DO NOTHING;"
-    )
-    await conn.close()
+    try:
+        await conn.executemany(
+            "INSERT INTO users (id, email, hashed_password, full_name, is_active, is_verified) "
+            "VALUES ($1, $2, $3, $4, $5, $6) "
+            "ON CONFLICT (id) DO NOTHING;",
+            users
+        )
+    finally:
+        await conn.close()
 
 if __name__ == "__main__":
+    try:
+        import uvloop
+        uvloop.install()
+    except ImportError:
+        pass
     asyncio.run(main()) 
\ No newline at end of file
@@ -11,18 +11,21 @@ MIGRATIONS = [
     }
 ]
 
-async def column_exists(conn, table, column):
-    result = await conn.fetchval(
+async def existing_columns(conn):
+    """All (table, column) pairs in the public schema, fetched in one catalog query"""
+    rows = await conn.fetch(
+        """
+        SELECT table_name, column_name FROM information_schema.columns
+        WHERE table_schema = 'public'
         """
-        SELECT 1 FROM information_schema.columns
-        WHERE table_name = $1 AND column_name = $2
-        """, table, column
     )
-    return result is not None
+    return {(row["table_name"], row["column_name"]) for row in rows}
 
 async def all_project_ids_are_uuids(conn):
-    rows = await conn.fetch("SELECT id FROM projects WHERE id !~* '^[0-9a-fA-F-]{36}$';")
-    return len(rows) == 0
+    # Stops at the first bad id instead of fetching every one
+    return await conn.fetchval(
+        "SELECT NOT EXISTS (SELECT 1 FROM projects WHERE id::text !~* '^[0-9a-fA-F-]{36}$');"
+    )
 
 async def convert_projects_id_to_uuid(conn):
     print("Converting projects.id from VARCHAR to UUID...")
@@ -41,9 +44,11 @@ async def run_migrations():
         return
     conn = await asyncpg.connect(db_url)
     try:
+        columns = await existing_columns(conn)
+        
         # Run standard migrations
         for mig in MIGRATIONS:
-            if await column_exists(conn, mig["table"], mig["column"]):
+            if (mig["table"], mig["column"]) in columns:
                 print(f"✅ Column '{mig['column']}' already exists in '{mig['table']}'. Skipping.")
             else:
                 try:
@@ -53,7 +58,7 @@ async def run_migrations():
                     print(f"❌ Failed to add column '{mig['column']}' to '{mig['table']}': {e}")
 
         # Handle dream_sessions.project_id migration
-        if await column_exists(conn, "dream_sessions", "project_id"):
+        if ("dream_sessions", "project_id") in columns:
             print("✅ Column 'project_id' already exists in 'dream_sessions'. Skipping.")
         else:
             print("Checking if all projects.id values are valid UUIDs...")
@@ -70,4 +75,9 @@ async def run_migrations():
         await conn.close()
 
 if __name__ == "__main__":
+    try:
+        import uvloop
+        uvloop.install()
+    except ImportError:
+        pass
     asyncio.run(run_migrations()) 
\ No newline at end of file
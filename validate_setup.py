@@ -5,9 +5,16 @@ Tests basic configuration without external dependencies
 """
 
 import os
+import re
 import sys
 import json
 from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+
+# Uncommented "NAME=" assignments and the DATABASE_URL line, each found in one scan of .env
+ENV_ASSIGNMENT_RE = re.compile(r"^[ \t]*([^#=\s][^=\n]*?)[ \t]*=", re.MULTILINE)
+DATABASE_URL_RE = re.compile(r"^DATABASE_URL=(.*)$", re.MULTILINE)
 
 # Colors for terminal output
 class Colors:
@@ -24,43 +31,56 @@ def print_header():
     print(f"{Colors.BOLD}🔍 DREAMENGINE AI PLATFORM - SETUP VALIDATION{Colors.END}")
     print("="*60 + "\n")
 
+@lru_cache(maxsize=None)
+def list_dir_entries(dirpath):
+    """Names in a directory, listed once and shared by every check under it"""
+    try:
+        with os.scandir(dirpath) as entries:
+            return frozenset(entry.name for entry in entries)
+    except OSError:
+        return frozenset()
+
 def check_file_exists(filepath, description):
     """Check if a file exists"""
-    if os.path.exists(filepath):
+    parent, name = os.path.split(filepath)
+    if name in list_dir_entries(parent or "."):
         print(f"{Colors.GREEN}✅{Colors.END} {description}: Found")
         return True
     else:
         print(f"{Colors.RED}❌{Colors.END} {description}: Missing")
         return False
 
+@lru_cache(maxsize=1)
+def read_env_file():
+    """Read .env once for every check (None if it is missing)"""
+    try:
+        with open(".env", "r") as f:
+            return f.read()
+    except FileNotFoundError:
+        return None
+
 def check_env_file():
     """Check .env file and configuration"""
     print(f"{Colors.BLUE}🧪 Checking Environment Configuration...{Colors.END}")
     
-    env_exists = check_file_exists(".env", ".env file")
+    # Read .env file (reading it is the existence check)
+    env_content = read_env_file()
+    if env_content is None:
+        print(f"{Colors.RED}❌{Colors.END} .env file: Missing")
+        return False
+    print(f"{Colors.GREEN}✅{Colors.END} .env file: Found")
     
-    if env_exists:
-        # Read .env file
-        with open(".env", "r") as f:
-            lines = f.readlines()
-        
-        # Check for critical variables
-        critical_vars = ["DATABASE_URL", "SECRET_KEY"]
-        found_vars = []
-        
-        for line in lines:
-            if "=" in line and not line.strip().startswith("#"):
-                var_name = line.split("=")[0].strip()
-                if var_name in critical_vars:
-                    found_vars.append(var_name)
-        
-        for var in critical_vars:
-            if var in found_vars:
-                print(f"  {Colors.GREEN}✅{Colors.END} {var}: Configured")
-            else:
-                print(f"  {Colors.YELLOW}⚠️{Colors.END}  {var}: Not found (will use default)")
+    # Check for critical variables
+    critical_vars = ["DATABASE_URL", "SECRET_KEY"]
+    found_vars = set(ENV_ASSIGNMENT_RE.findall(env_content))
+    
+    for var in critical_vars:
+        if var in found_vars:
+            print(f"  {Colors.GREEN}✅{Colors.END} {var}: Configured")
+        else:
+            print(f"  {Colors.YELLOW}⚠️{Colors.END}  {var}: Not found (will use default)")
     
-    return env_exists
+    return True
 
 def check_project_structure():
     """Check project structure"""
@@ -102,13 +122,8 @@ def check_database_url():
     print(f"\n{Colors.BLUE}🧪 Checking Database Configuration...{Colors.END}")
     
     # Try to read from .env
-    db_url = None
-    if os.path.exists(".env"):
-        with open(".env", "r") as f:
-            for line in f:
-                if line.startswith("DATABASE_URL="):
-                    db_url = line.split("=", 1)[1].strip()
-                    break
+    match = DATABASE_URL_RE.search(read_env_file() or "")
+    db_url = match.group(1).strip() if match else None
     
     if db_url:
         if db_url.startswith("postgresql://"):
@@ -139,10 +154,8 @@ def check_optional_features():
         "WEB3_PROVIDER_URL": "Smart Contracts"
     }
     
-    if os.path.exists(".env"):
-        with open(".env", "r") as f:
-            env_content = f.read()
-        
+    env_content = read_env_file()
+    if env_content is not None:
         for key, feature in features.items():
             if key in env_content and not f"# {key}" in env_content:
                 print(f"{Colors.GREEN}✅{Colors.END} {feature}: Configured")
@@ -190,6 +203,12 @@ def main():
     
     results = []
     
+    # Do the filesystem reads concurrently up front; the checks below then print
+    # in order from the cached results
+    with ThreadPoolExecutor(max_workers=3) as executor:
+        executor.submit(read_env_file)
+        executor.map(list_dir_entries, (".", "app"))
+    
     # Run checks
     results.append(check_env_file())
     results.append(check_project_structure())